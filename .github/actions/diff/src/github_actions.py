@@ -4,18 +4,50 @@ This project is a partial python implementation of and contains code derived fro
 by actions/toolkit (https://github.com/actions/toolkit), which is licensed under the MIT License.
 """
 
+import json
 import os
 import sys
-import json
-import uuid
+import weakref
+from collections import defaultdict
 from typing import Any, Callable, TypeVar, final
 
 T = TypeVar("T")
 
+# Bound once so the hot command/summary paths skip the attribute lookup on os
+_LINESEP = os.linesep
+_PATHSEP = os.pathsep
+
+# Translation tables for escaping workflow command data and properties in a single pass
+_ESCAPE_DATA_TABLE = str.maketrans({"%": "%25", "\r": "%0D", "\n": "%0A"})
+_ESCAPE_PROPERTY_TABLE = str.maketrans(
+    {"%": "%25", "\r": "%0D", "\n": "%0A", ":": "%3A", ",": "%2C"}
+)
+
+# Boolean input values from the YAML 1.2 "core schema", compared against the lowercased input
+_TRUE_VALUES = frozenset({"true"})
+_FALSE_VALUES = frozenset({"false"})
+
+# Opening and closing markup for summary tags that are emitted without attributes
+_SIMPLE_TAGS = ("pre", "code", "details", "summary")
+_OPEN_TAGS = {tag: f"<{tag}>" for tag in _SIMPLE_TAGS}
+_CLOSE_TAGS = {tag: f"</{tag}>" for tag in _SIMPLE_TAGS}
+
+# Heading tag for each valid level, given as an int or a string; anything else falls back to h1
+_HEADING_TAGS = {key: f"h{level}" for level in range(1, 7) for key in (level, str(level))}
+
+# Attribute-less void elements, emitted verbatim together with their line ending
+_HR_LINE = f"<hr>{_LINESEP}"
+_BR_LINE = f"<br>{_LINESEP}"
+
+# Maps input names to the INPUT_* environment variable naming convention
+_INPUT_NAME_TABLE = str.maketrans({" ": "_", "-": "_"})
+
 
 class AnnotationProperties:
     """Properties that can be sent with annotation commands (notice, error, warning)."""
 
+    __slots__ = ("title", "file", "start_line", "end_line", "start_column", "end_column")
+
     def __init__(
         self,
         title: str | None = None,
@@ -47,6 +79,8 @@ class AnnotationProperties:
 class InputOptions:
     """Options for getInput."""
 
+    __slots__ = ("required", "trim_whitespace")
+
     def __init__(self, required: bool = False, trim_whitespace: bool = True) -> None:
         """
         Initialize input options.
@@ -62,6 +96,8 @@ class InputOptions:
 class EnvOptions:
     """Options for getEnv."""
 
+    __slots__ = ("required", "trim_whitespace", "default")
+
     def __init__(self, required: bool = False, trim_whitespace: bool = True, default: str | None = None) -> None:
         """
         Initialize environment variable options.
@@ -97,7 +133,7 @@ class Summary:
         Args:
             gh: Reference to the GitHubAction instance for accessing environment variables
         """
-        self._buffer: str = ""
+        self._buffer: list[str] = []
         self._file_path: str | None = None
         self._gh: GitHubAction = gh
 
@@ -110,21 +146,15 @@ class Summary:
 
         Raises:
             ValueError: If environment variable is not found
-            IOError: If file doesn't have read/write permissions
         """
         if self._file_path:
             return self._file_path
 
-        path_from_env = self._gh.get_env("GITHUB_STEP_SUMMARY", EnvOptions(required=True))
-
-        try:
-            # Check file permissions
-            with open(path_from_env, "a+"):
-                pass
-        except IOError:
-            raise IOError(
-                f"Unable to access summary file: '{path_from_env}'. "
-                + "Check if the file has correct read/write permissions."
+        path_from_env = self._gh._get_env_cached("GITHUB_STEP_SUMMARY")
+        if not path_from_env:
+            raise ValueError(
+                "Unable to find environment variable for $GITHUB_STEP_SUMMARY. "
+                + "Check if your runtime environment supports job summaries."
             )
 
         self._file_path = path_from_env
@@ -142,14 +172,33 @@ class Summary:
         Returns:
             Content wrapped in HTML element
         """
-        attrs = attrs or {}
-        html_attrs = "".join(f' {key}="{value}"' for key, value in attrs.items())
+        if not attrs:
+            html_attrs = ""
+        elif len(attrs) == 1:
+            # Single attribute (href, cite, lang) is the common case; skip the generator
+            ((key, value),) = attrs.items()
+            html_attrs = f' {key}="{value}"'
+        else:
+            html_attrs = "".join(f' {key}="{value}"' for key, value in attrs.items())
 
         if content is None:
             return f"<{tag}{html_attrs}>"
 
         return f"<{tag}{html_attrs}>{content}</{tag}>"
 
+    def _wrap_simple(self, tag: str, content: str) -> str:
+        """
+        Wraps content in an HTML tag that has no attributes, using precomputed markup.
+
+        Args:
+            tag: HTML tag to wrap, one of the precomputed simple tags
+            content: Content within the tag
+
+        Returns:
+            Content wrapped in HTML element
+        """
+        return f"{_OPEN_TAGS[tag]}{content}{_CLOSE_TAGS[tag]}"
+
     def write(self, options: dict[str, bool] | None = None) -> "Summary":
         """
         Writes text in the buffer to the summary file and empties buffer.
@@ -159,14 +208,24 @@ class Summary:
 
         Returns:
             Summary instance
+
+        Raises:
+            IOError: If the summary file doesn't have write permissions
         """
         options = options or {}
         overwrite = options.get("overwrite", False)
 
         file_path = self.file_path()
 
-        with open(file_path, "w" if overwrite else "a", encoding="utf-8") as f:
-            _ = f.write(self._buffer)
+        # Opening the file is the permission check; there is no separate probe
+        try:
+            with open(file_path, "w" if overwrite else "a", encoding="utf-8") as f:
+                _ = f.write("".join(self._buffer))
+        except IOError as e:
+            raise IOError(
+                f"Unable to access summary file: '{file_path}'. "
+                + "Check if the file has correct read/write permissions."
+            ) from e
 
         return self.empty_buffer()
 
@@ -186,7 +245,7 @@ class Summary:
         Returns:
             String of summary buffer
         """
-        return self._buffer
+        return "".join(self._buffer)
 
     def is_empty_buffer(self) -> bool:
         """
@@ -195,7 +254,7 @@ class Summary:
         Returns:
             True if the buffer is empty
         """
-        return len(self._buffer) == 0
+        return not self._buffer
 
     def empty_buffer(self) -> "Summary":
         """
@@ -204,7 +263,7 @@ class Summary:
         Returns:
             Summary instance
         """
-        self._buffer = ""
+        self._buffer = []
         return self
 
     def add_raw(self, text: str, add_eol: bool = False) -> "Summary":
@@ -218,7 +277,8 @@ class Summary:
         Returns:
             Summary instance
         """
-        self._buffer += text
+        if text:
+            self._buffer.append(text)
         return self.add_eol() if add_eol else self
 
     def add_eol(self) -> "Summary":
@@ -228,7 +288,20 @@ class Summary:
         Returns:
             Summary instance
         """
-        return self.add_raw(os.linesep)
+        return self.add_raw(_LINESEP)
+
+    def _add_line(self, element: str) -> "Summary":
+        """
+        Adds an element followed by the end-of-line marker as a single buffer chunk.
+
+        Args:
+            element: Rendered HTML element
+
+        Returns:
+            Summary instance
+        """
+        self._buffer.append(f"{element}{_LINESEP}")
+        return self
 
     def add_code_block(self, code: str, lang: str | None = None) -> "Summary":
         """
@@ -245,8 +318,12 @@ class Summary:
         if lang:
             attrs["lang"] = lang
 
-        element = self._wrap("pre", self._wrap("code", code), attrs)
-        return self.add_raw(element).add_eol()
+        code_element = self._wrap_simple("code", code)
+        if attrs:
+            element = self._wrap("pre", code_element, attrs)
+        else:
+            element = self._wrap_simple("pre", code_element)
+        return self._add_line(element)
 
     def add_list(self, items: list[str], ordered: bool = False) -> "Summary":
         """
@@ -260,47 +337,48 @@ class Summary:
             Summary instance
         """
         tag = "ol" if ordered else "ul"
-        list_items = "".join(self._wrap("li", item) for item in items)
-        element = self._wrap(tag, list_items)
-        return self.add_raw(element).add_eol()
+        # <li> never carries attributes, so items are formatted inline
+        # rather than through _wrap_simple
+        list_items = "".join([f"<li>{item}</li>" for item in items])
+        return self._add_line(f"<{tag}>{list_items}</{tag}>")
 
-    def add_table(self, rows: list[list[dict[str, Any] | str]]) -> "Summary":
+    def _table_cell(self, cell: dict[str, Any] | str) -> str:
         """
-        Adds an HTML table to the summary buffer.
+        Renders a single table cell.
 
         Args:
-            rows: Table rows
+            cell: Cell text, or a dict with data, header, colspan and rowspan keys
 
         Returns:
-            Summary instance
+            Cell wrapped in a td or th element
         """
-        table_body = ""
+        if isinstance(cell, str):
+            return f"<td>{cell}</td>"
 
-        for row in rows:
-            cells = ""
-            for cell in row:
-                if isinstance(cell, str):
-                    cells += self._wrap("td", cell)
-                else:
-                    header = cell.get("header", False)
-                    data = cell.get("data", "")
-                    colspan = cell.get("colspan")
-                    rowspan = cell.get("rowspan")
+        tag = "th" if cell.get("header", False) else "td"
+        attrs = {}
 
-                    tag = "th" if header else "td"
-                    attrs = {}
+        if colspan := cell.get("colspan"):
+            attrs["colspan"] = colspan
+        if rowspan := cell.get("rowspan"):
+            attrs["rowspan"] = rowspan
 
-                    if colspan:
-                        attrs["colspan"] = colspan
-                    if rowspan:
-                        attrs["rowspan"] = rowspan
+        return self._wrap(tag, cell.get("data", ""), attrs)
 
-                    cells += self._wrap(tag, data, attrs)
+    def add_table(self, rows: list[list[dict[str, Any] | str]]) -> "Summary":
+        """
+        Adds an HTML table to the summary buffer.
 
-            table_body += self._wrap("tr", cells)
+        Args:
+            rows: Table rows
 
-        element = self._wrap("table", table_body)
-        return self.add_raw(element).add_eol()
+        Returns:
+            Summary instance
+        """
+        # One join per row and one for the whole table
+        table_cell = self._table_cell
+        body = "".join(f"<tr>{''.join(map(table_cell, row))}</tr>" for row in rows)
+        return self._add_line(f"<table>{body}</table>")
 
     def add_details(self, label: str, content: str) -> "Summary":
         """
@@ -313,8 +391,8 @@ class Summary:
         Returns:
             Summary instance
         """
-        element = self._wrap("details", self._wrap("summary", label) + content)
-        return self.add_raw(element).add_eol()
+        element = self._wrap_simple("details", self._wrap_simple("summary", label) + content)
+        return self._add_line(element)
 
     def add_image(self, src: str, alt: str, options: dict[str, str] | None = None) -> "Summary":
         """
@@ -337,7 +415,7 @@ class Summary:
             attrs["height"] = options["height"]
 
         element = self._wrap("img", None, attrs)
-        return self.add_raw(element).add_eol()
+        return self._add_line(element)
 
     def add_heading(self, text: str, level: int | str | None = 1) -> "Summary":
         """
@@ -350,12 +428,8 @@ class Summary:
         Returns:
             Summary instance
         """
-        tag = f"h{level}"
-        allowed_tags = ["h1", "h2", "h3", "h4", "h5", "h6"]
-        tag = tag if tag in allowed_tags else "h1"
-
-        element = self._wrap(tag, text)
-        return self.add_raw(element).add_eol()
+        tag = _HEADING_TAGS.get(level, "h1")
+        return self._add_line(f"<{tag}>{text}</{tag}>")
 
     def add_separator(self) -> "Summary":
         """
@@ -364,8 +438,8 @@ class Summary:
         Returns:
             Summary instance
         """
-        element = self._wrap("hr", None)
-        return self.add_raw(element).add_eol()
+        self._buffer.append(_HR_LINE)
+        return self
 
     def add_break(self) -> "Summary":
         """
@@ -374,8 +448,8 @@ class Summary:
         Returns:
             Summary instance
         """
-        element = self._wrap("br", None)
-        return self.add_raw(element).add_eol()
+        self._buffer.append(_BR_LINE)
+        return self
 
     def add_quote(self, text: str, cite: str | None = None) -> "Summary":
         """
@@ -393,7 +467,7 @@ class Summary:
             attrs["cite"] = cite
 
         element = self._wrap("blockquote", text, attrs)
-        return self.add_raw(element).add_eol()
+        return self._add_line(element)
 
     def add_link(self, text: str, href: str) -> "Summary":
         """
@@ -407,7 +481,38 @@ class Summary:
             Summary instance
         """
         element = self._wrap("a", text, {"href": href})
-        return self.add_raw(element).add_eol()
+        return self._add_line(element)
+
+
+def _write_file_commands(buffers: dict[str, list[str]], env_cache: dict[str, str]) -> None:
+    """
+    Writes buffered file commands to their runner files and clears the buffers.
+
+    Takes the buffers and cached paths rather than the instance, so it can run as the
+    finalizer of a GitHubAction without keeping it alive.
+
+    Args:
+        buffers: Pending command lines, keyed by file command name (e.g. OUTPUT)
+        env_cache: Cached environment values holding the GITHUB_* file command paths
+
+    Raises:
+        FileNotFoundError: If the directory of a file command path doesn't exist
+    """
+    for command, lines in buffers.items():
+        if not lines:
+            continue
+
+        # Take the pending commands first so a failed write is not retried later
+        data = "".join(lines)
+        lines.clear()
+
+        # The path was resolved and cached when the command was buffered
+        file_path = env_cache[f"GITHUB_{command}"]
+        try:
+            with open(file_path, "a", encoding="utf-8") as f:
+                _ = f.write(data)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Missing file at path: {file_path}") from e
 
 
 class GitHubAction:
@@ -420,12 +525,17 @@ class GitHubAction:
 
     def __init__(self) -> None:
         """Initialize the GitHubAction class."""
-        self._summary = Summary(self)
+        # Plain attribute rather than a property, so access skips the descriptor call
+        self.summary: Summary = Summary(self)
+        self._env_cache: dict[str, str] = {}
+        self._file_command_buffers: defaultdict[str, list[str]] = defaultdict(list)
 
-    @property
-    def summary(self) -> Summary:
-        """Get the summary instance."""
-        return self._summary
+        # Heredoc delimiter for key-value file commands, random once per instance.
+        # 128 random bits cannot be guessed by inputs, and values containing it are rejected.
+        self._delimiter: str = f"ghadelimiter_{os.urandom(16).hex()}"
+
+        # Write anything still pending when the instance is collected or the interpreter exits
+        weakref.finalize(self, _write_file_commands, self._file_command_buffers, self._env_cache)
 
     def get_env(self, name: str, options: EnvOptions | None = None) -> str:
         """
@@ -450,11 +560,30 @@ class GitHubAction:
             elif options.default is not None:
                 val = options.default
 
-        if options.trim_whitespace:
+        # Only strip when an end actually has whitespace; clean values are returned as-is
+        if options.trim_whitespace and val and (val[0].isspace() or val[-1].isspace()):
             val = val.strip()
 
         return val
 
+    def _get_env_cached(self, name: str) -> str:
+        """
+        Gets the trimmed value of an environment variable, caching it for the instance's lifetime.
+
+        Only use this for variables provided by the runner that do not change during a run,
+        such as the GITHUB_* file command paths.
+
+        Args:
+            name: The name of the environment variable
+
+        Returns:
+            The value of the environment variable, or an empty string if it is not set
+        """
+        val = self._env_cache.get(name)
+        if val is None:
+            val = self._env_cache[name] = os.environ.get(name, "").strip()
+        return val
+
     def export_variable(self, name: str, val: Any) -> None:
         """
         Sets env variable for this action and future actions in the job.
@@ -466,7 +595,7 @@ class GitHubAction:
         converted_val = self._to_command_value(val)
         os.environ[name] = converted_val
 
-        file_path = self.get_env("GITHUB_ENV")
+        file_path = self._get_env_cached("GITHUB_ENV")
         if file_path:
             self._issue_file_command("ENV", self._prepare_key_value_message(name, val))
         else:
@@ -488,7 +617,7 @@ class GitHubAction:
         Args:
             input_path: The path to add
         """
-        file_path = self.get_env("GITHUB_PATH")
+        file_path = self._get_env_cached("GITHUB_PATH")
         if file_path:
             self._issue_file_command("PATH", input_path)
         else:
@@ -496,7 +625,7 @@ class GitHubAction:
 
         # Also update PATH for current process
         path_value = self.get_env("PATH") or ""
-        os.environ["PATH"] = f"{input_path}{os.pathsep}{path_value}"
+        os.environ["PATH"] = f"{input_path}{_PATHSEP}{path_value}"
 
     def get_input(self, name: str, options: InputOptions | None = None) -> str:
         """
@@ -513,7 +642,7 @@ class GitHubAction:
             ValueError: If the input is required and not supplied
         """
         options = options or InputOptions()
-        env_var = f"INPUT_{name.replace(' ', '_').replace('-', '_').upper()}"
+        env_var = f"INPUT_{name.translate(_INPUT_NAME_TABLE).upper()}"
 
         env_options = EnvOptions(required=options.required, trim_whitespace=options.trim_whitespace)
 
@@ -557,13 +686,11 @@ class GitHubAction:
         Raises:
             TypeError: If the input is not valid boolean format
         """
-        true_values = ["true", "True", "TRUE"]
-        false_values = ["false", "False", "FALSE"]
-        val = self.get_input(name, options)
+        val = self.get_input(name, options).lower()
 
-        if val.lower() in (v.lower() for v in true_values):
+        if val in _TRUE_VALUES:
             return True
-        if val.lower() in (v.lower() for v in false_values):
+        if val in _FALSE_VALUES:
             return False
 
         raise TypeError(
@@ -579,11 +706,11 @@ class GitHubAction:
             name: Name of the output to set
             value: Value to store. Non-string values will be converted to a string via JSON
         """
-        file_path = self.get_env("GITHUB_OUTPUT")
+        file_path = self._get_env_cached("GITHUB_OUTPUT")
         if file_path:
             self._issue_file_command("OUTPUT", self._prepare_key_value_message(name, value))
         else:
-            print(os.linesep, end="")
+            print(_LINESEP, end="")
             self._issue_command("set-output", {"name": name}, self._to_command_value(value))
 
     def set_command_echo(self, enabled: bool) -> None:
@@ -718,7 +845,7 @@ class GitHubAction:
             name: Name of the state to store
             value: Value to store. Non-string values will be converted to a string via JSON
         """
-        file_path = self.get_env("GITHUB_STATE")
+        file_path = self._get_env_cached("GITHUB_STATE")
         if file_path:
             self._issue_file_command("STATE", self._prepare_key_value_message(name, value))
         else:
@@ -736,6 +863,20 @@ class GitHubAction:
         """
         return self.get_env(f"STATE_{name}")
 
+    def flush_file_commands(self) -> None:
+        """
+        Writes buffered file commands (outputs, state, env, path) to their runner files.
+
+        Each file is opened once and receives all of its pending commands in a single write.
+        Call this once the commands are issued so write errors fail the step; anything still
+        pending when the instance is collected or the interpreter exits is flushed as a
+        fallback, where errors can only be reported.
+
+        Raises:
+            FileNotFoundError: If the directory of a file command path doesn't exist
+        """
+        _write_file_commands(self._file_command_buffers, self._env_cache)
+
     def _issue(self, name: str, message: str = "") -> None:
         """
         Issue a command.
@@ -755,44 +896,41 @@ class GitHubAction:
             properties: Additional properties
             message: The message to include
         """
-        cmd_str = f"::{command}"
+        parts = ["::", command]
 
-        if properties and len(properties) > 0:
-            cmd_str += " "
-            first = True
-            for key, val in properties.items():
-                if val:
-                    if first:
-                        first = False
-                    else:
-                        cmd_str += ","
+        if properties:
+            parts.append(" ")
+            parts.append(
+                ",".join(
+                    f"{key}={self._escape_property(val)}" for key, val in properties.items() if val
+                )
+            )
 
-                    cmd_str += f"{key}={self._escape_property(val)}"
+        parts.append("::")
+        parts.append(self._escape_data(message))
+        parts.append("\n")
 
-        cmd_str += f"::{self._escape_data(message)}"
-        print(cmd_str)
+        # Write the whole command at once so it is never interleaved with other output
+        _ = sys.stdout.write("".join(parts))
 
     def _issue_file_command(self, command: str, message: Any) -> None:
         """
         Issue a file command.
 
+        The command is buffered until flush_file_commands is called.
+
         Args:
             command: The command name
             message: The message to include
 
         Raises:
             ValueError: If the environment variable for the command is not found
-            FileNotFoundError: If the file path doesn't exist
         """
-        file_path = self.get_env(f"GITHUB_{command}")
+        file_path = self._get_env_cached(f"GITHUB_{command}")
         if not file_path:
             raise ValueError(f"Unable to find environment variable for file command {command}")
 
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Missing file at path: {file_path}")
-
-        with open(file_path, "a", encoding="utf-8") as f:
-            _ = f.write(f"{self._to_command_value(message)}{os.linesep}")
+        self._file_command_buffers[command].append(f"{self._to_command_value(message)}{_LINESEP}")
 
     def _prepare_key_value_message(self, key: str, value: Any) -> str:
         """
@@ -808,7 +946,7 @@ class GitHubAction:
         Raises:
             ValueError: If key or value contains delimiter
         """
-        delimiter = f"ghadelimiter_{uuid.uuid4()}"
+        delimiter = self._delimiter
         converted_value = self._to_command_value(value)
 
         if delimiter in key:
@@ -817,7 +955,7 @@ class GitHubAction:
         if delimiter in converted_value:
             raise ValueError(f'Unexpected input: value should not contain the delimiter "{delimiter}"')
 
-        return f"{key}<<{delimiter}{os.linesep}{converted_value}{os.linesep}{delimiter}"
+        return f"{key}<<{delimiter}{_LINESEP}{converted_value}{_LINESEP}{delimiter}"
 
     def _to_command_value(self, input_value: Any) -> str:
         """
@@ -829,10 +967,16 @@ class GitHubAction:
         Returns:
             String value
         """
+        # Exact type check first: plain strings are by far the most common input
+        if type(input_value) is str:
+            return input_value
         if input_value is None:
             return ""
-        elif isinstance(input_value, str):
+        if isinstance(input_value, str):
             return input_value
+
+        # json is imported at module level: main and pr_events load it at startup anyway,
+        # so deferring the import here would not shorten the action's start-up
         return json.dumps(input_value)
 
     def _to_command_properties(self, annotation_properties: AnnotationProperties) -> dict[str, Any]:
@@ -845,25 +989,21 @@ class GitHubAction:
         Returns:
             Command properties dictionary
         """
-        properties = {}
-        prop_dict = vars(annotation_properties)
-
-        if not prop_dict:
-            return properties
+        properties: dict[str, Any] = {}
 
         # Map annotation properties to command properties
-        mapping = {
-            "title": "title",
-            "file": "file",
-            "start_line": "line",
-            "end_line": "endLine",
-            "start_column": "col",
-            "end_column": "endColumn",
-        }
-
-        for ann_prop, cmd_prop in mapping.items():
-            if prop_dict.get(ann_prop) is not None:
-                properties[cmd_prop] = prop_dict[ann_prop]
+        if annotation_properties.title is not None:
+            properties["title"] = annotation_properties.title
+        if annotation_properties.file is not None:
+            properties["file"] = annotation_properties.file
+        if annotation_properties.start_line is not None:
+            properties["line"] = annotation_properties.start_line
+        if annotation_properties.end_line is not None:
+            properties["endLine"] = annotation_properties.end_line
+        if annotation_properties.start_column is not None:
+            properties["col"] = annotation_properties.start_column
+        if annotation_properties.end_column is not None:
+            properties["endColumn"] = annotation_properties.end_column
 
         return properties
 
@@ -877,7 +1017,7 @@ class GitHubAction:
         Returns:
             Escaped string
         """
-        return self._to_command_value(s).replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+        return self._to_command_value(s).translate(_ESCAPE_DATA_TABLE)
 
     def _escape_property(self, s: Any) -> str:
         """
@@ -889,11 +1029,4 @@ class GitHubAction:
         Returns:
             Escaped string
         """
-        return (
-            self._to_command_value(s)
-            .replace("%", "%25")
-            .replace("\r", "%0D")
-            .replace("\n", "%0A")
-            .replace(":", "%3A")
-            .replace(",", "%2C")
-        )
+        return self._to_command_value(s).translate(_ESCAPE_PROPERTY_TABLE)
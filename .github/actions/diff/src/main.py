@@ -4,6 +4,8 @@ Main driver for the changed files GitHub Action.
 Detects and reports files changed in either push or pull request events.
 """
 
+import functools
+import html
 import json
 import os
 
@@ -12,11 +14,24 @@ from pr_events import get_pr_changed_files
 from push_events import get_push_changed_files
 from utils import FilesByStatus, OutputFormat
 
+# Output strings for boolean values, indexed by the bool
+_BOOL_STR = ("false", "true")
 
+# Sections shown in the step summary, as (heading, FilesByStatus key)
+_SUMMARY_CATEGORIES = (
+    ("Added Files", "added"),
+    ("Modified Files", "modified"),
+    ("Deleted Files", "removed"),
+)
+
+
+@functools.lru_cache(maxsize=1)
 def get_event_type() -> str:
     """
     Determine if the action is running on a PR or push event.
 
+    The event name is fixed for the whole run, so the result is memoized.
+
     Returns:
         String indicating the event type ('pull_request' or 'push')
     """
@@ -32,23 +47,21 @@ def create_summary_lists(action: GitHubAction, changed_files: FilesByStatus) ->
         action: The GitHub Action instance
         changed_files: Files categorized by status
     """
-    # Add title to the summary
-    action.summary.add_heading("Changed Files Summary", 2)
+    # Assemble the title and one heading plus list per non-empty category, one element per line
+    lines = ["<h2>Changed Files Summary</h2>"]
 
-    # Categories to display in the summary
-    categories = [("Added Files", "added"), ("Modified Files", "modified"), ("Deleted Files", "removed")]
-
-    # Create lists for each category
-    for title, category in categories:
+    for title, category in _SUMMARY_CATEGORIES:
         files = changed_files[category]
         if not files:
             continue
 
-        # Add section heading
-        action.summary.add_heading(title, 3)
+        # File names are text, so escape any markup characters in them
+        items = "".join([f"<li>{html.escape(path, quote=False)}</li>" for path in files])
+        lines.append(f"<h3>{title}</h3>")
+        lines.append(f"<ul>{items}</ul>")
 
-        # Add the list to the summary
-        action.summary.add_list(files)
+    # Add the whole summary to the buffer in one chunk
+    action.summary.add_raw(os.linesep.join(lines), True)
 
     # Try to write the summary
     try:
@@ -77,13 +90,16 @@ def set_action_outputs(action: GitHubAction, changed_files: FilesByStatus) -> No
     }
 
     # Set any-changed boolean output
-    has_changes = (
-        len(changed_files["added"]) > 0 or len(changed_files["modified"]) > 0 or len(changed_files["removed"]) > 0
+    has_changes = any(output.values())
+    action.set_output("any-changed", _BOOL_STR[has_changes])
+
+    # Set the JSON output with all file categories; compact, with non-ASCII filenames written as-is
+    action.set_output(
+        "changed-files", json.dumps(output, ensure_ascii=False, separators=(",", ":"))
     )
-    action.set_output("any-changed", str(has_changes).lower())
 
-    # Set the JSON output with all file categories
-    action.set_output("changed-files", json.dumps(output))
+    # Write the outputs now, so a missing or unwritable output file fails the step
+    action.flush_file_commands()
 
     action.info("Outputs set successfully")
 
@@ -127,7 +143,10 @@ def main() -> None:
     elif event_type == "push":
         # Get changed files for push event
         action.info("Retrieving changed files from push event...")
-        changed_files = get_push_changed_files(base_sha=base_sha, head_sha=head_sha, patterns=filters)
+        # Outputs only report added, modified and deleted files, so skip git's rename detection
+        changed_files = get_push_changed_files(
+            base_sha=base_sha, head_sha=head_sha, patterns=filters, detect_renames=False
+        )
     else:
         action.error(f"Unsupported event type: {event_type}")
         return
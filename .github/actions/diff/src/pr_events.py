@@ -1,12 +1,21 @@
 #!/usr/bin/env python3
 """Pull request functionality for detecting changed files."""
 
+import functools
 import json
 import os
 import subprocess
-from typing import TypedDict, cast
+import tempfile
+import traceback
+from typing import Any, TypedDict, cast
 
-from utils import FilesByStatus, filter_files_by_patterns
+from utils import FilesByStatus, merge_renames, pattern_matcher
+
+# Largest page size the pull request files endpoint accepts (the default is 30)
+MAX_PER_PAGE = 100
+
+# jq filter applied by gh to every page: one compact JSON object per file, without patches
+FILES_JQ_FILTER = ".[] | {filename, status, previous_filename}"
 
 
 class FileChange(TypedDict):
@@ -17,10 +26,31 @@ class FileChange(TypedDict):
     previous_filename: str | None
 
 
+def load_event_payload(event_path: str) -> dict[str, Any]:
+    """
+    Load the webhook event payload that triggered the workflow.
+
+    Args:
+        event_path: Path to the event payload file (GITHUB_EVENT_PATH)
+
+    Returns:
+        The parsed event payload
+
+    Raises:
+        json.JSONDecodeError: If the payload is not valid JSON
+        FileNotFoundError: If the payload file does not exist
+    """
+    with open(event_path, "r", encoding="utf-8") as f:
+        return cast(dict[str, Any], json.load(f))
+
+
+@functools.lru_cache(maxsize=1)
 def get_pr_number_from_event() -> int | None:
     """
     Get the PR number from the GitHub event context.
 
+    The event context is fixed for the whole run, so the result is memoized.
+
     Returns:
         The PR number if available, None otherwise.
     """
@@ -29,13 +59,13 @@ def get_pr_number_from_event() -> int | None:
         return None
 
     try:
-        with open(event_path, "r", encoding="utf-8") as f:
-            event_data = json.load(f)
-            pull_request = event_data.get("pull_request", {})
-            return pull_request.get("number")
+        event_data = load_event_payload(event_path)
     except (json.JSONDecodeError, FileNotFoundError):
         return None
 
+    pull_request = event_data.get("pull_request", {})
+    return pull_request.get("number")
+
 
 def get_changed_files(pr_number: int, token: str | None = None) -> list[FileChange]:
     """
@@ -51,48 +81,86 @@ def get_changed_files(pr_number: int, token: str | None = None) -> list[FileChan
     Raises:
         subprocess.CalledProcessError: If the GitHub CLI command fails
     """
-    env = os.environ.copy()
-    if token:
-        env["GH_TOKEN"] = token
-
-    # Use the gh api command to get files from a PR (handles pagination)
-    cmd = ["gh", "api", f"repos/{os.environ.get('GITHUB_REPOSITORY', '')}/pulls/{pr_number}/files", "--paginate"]
-
-    result = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
-
-    # Parse the JSON response
-    return cast(list[FileChange], json.loads(result.stdout))
-
-
-def categorize_files(files: list[FileChange]) -> FilesByStatus:
+    # Only build a new environment when the token has to be injected; otherwise gh inherits ours
+    env = None
+    if token and os.environ.get("GH_TOKEN") != token:
+        env = {**os.environ, "GH_TOKEN": token}
+
+    # Use the gh api command to get files from a PR (handles pagination).
+    # Request the maximum page size so large PRs need as few round-trips as possible.
+    repository = os.environ.get("GITHUB_REPOSITORY", "")
+    cmd = [
+        "gh",
+        "api",
+        f"repos/{repository}/pulls/{pr_number}/files?per_page={MAX_PER_PAGE}",
+        "--paginate",
+        "--jq",
+        FILES_JQ_FILTER,
+    ]
+
+    # Parse each file as gh prints it instead of buffering the whole paginated response.
+    # stderr goes to a temporary file: a second pipe that is only read after stdout ends
+    # would deadlock once gh fills its buffer.
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as stderr_file:
+        process = subprocess.Popen(
+            cmd, env=env, stdout=subprocess.PIPE, stderr=stderr_file, text=True
+        )
+        with process:
+            files = [
+                cast(FileChange, json.loads(line)) for line in process.stdout or () if line.strip()
+            ]
+
+        if process.returncode:
+            _ = stderr_file.seek(0)
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr_file.read())
+
+    return files
+
+
+def categorize_and_filter_files(
+    files: list[FileChange], patterns: list[str] | None = None
+) -> FilesByStatus:
     """
-    Categorize files by their status.
+    Categorize files by their status and filter them by glob patterns in a single pass.
+
+    Renamed files are merged in the same way as for push events (see utils.merge_renames).
 
     Args:
         files: list of file changes from GitHub API
+        patterns: list of glob patterns to filter by (all files are kept if empty)
 
     Returns:
-        Dictionary with files categorized by status
+        Filtered dictionary with files categorized by status
     """
-    categories: FilesByStatus = {"added": [], "modified": [], "removed": [], "renamed": [], "all": []}
+    added: list[str] = []
+    modified: list[str] = []
+    removed: list[str] = []
+    renames: list[dict[str, str]] = []
+
+    appenders = {"added": added.append, "modified": modified.append, "removed": removed.append}
+    matches = pattern_matcher(patterns)
 
     for file in files:
-        filename = file["filename"]
         status = file["status"]
+        filename = file["filename"]
 
-        # Add to the appropriate category
-        if status == "added":
-            categories["added"].append(filename)
-        elif status == "modified":
-            categories["modified"].append(filename)
-        elif status == "removed":
-            categories["removed"].append(filename)
+        append = appenders.get(status)
+        if append is not None:
+            if matches is None or matches(filename):
+                append(filename)
         elif status == "renamed":
             previous_filename = file.get("previous_filename")
             if previous_filename:
-                categories["renamed"].append({"old": previous_filename, "new": filename})
+                renames.append({"old": previous_filename, "new": filename})
 
-    return categories
+    result: FilesByStatus = {
+        "added": added,
+        "modified": modified,
+        "removed": removed,
+        "renamed": [],
+    }
+    merge_renames(result, renames, matches)
+    return result
 
 
 def get_pr_changed_files(
@@ -120,19 +188,14 @@ def get_pr_changed_files(
         files = get_changed_files(pr_num, token)
         print(f"Retrieved {len(files)} changed files from PR #{pr_num}")
 
-        # Categorize files by status
-        categorized_files = categorize_files(files)
-
-        return filter_files_by_patterns(categorized_files, patterns)
+        # Categorize and filter files by status in one pass over the API results
+        return categorize_and_filter_files(files, patterns)
 
     except subprocess.CalledProcessError as e:
         print(f"Error executing GitHub CLI: {e}")
-        print(f"STDOUT: {e.stdout}")
         print(f"STDERR: {e.stderr}")
         return None
     except Exception as e:
         print(f"Error processing changed files: {str(e)}")
-        import traceback
-
         print(traceback.format_exc())
         return None
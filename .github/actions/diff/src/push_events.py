@@ -3,11 +3,20 @@
 
 import os
 import subprocess
+import traceback
 
 from utils import FilesByStatus, filter_files_by_patterns
 
+# GITHUB_BEFORE value for the first push to a new branch
+_NULL_SHA = "0000000000000000000000000000000000000000"
 
-def get_changed_files_from_git(base_sha: str, head_sha: str, repo_path: str | None = None) -> dict[str, list[str]]:
+# Git's well-known empty tree object, used as the base when there is no previous commit
+_EMPTY_TREE_SHA = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+def get_changed_files_from_git(
+    base_sha: str, head_sha: str, repo_path: str | None = None, detect_renames: bool = True
+) -> FilesByStatus:
     """
     Get changed files between two Git commits using git diff.
 
@@ -15,49 +24,135 @@ def get_changed_files_from_git(base_sha: str, head_sha: str, repo_path: str | No
         base_sha: Base commit SHA
         head_sha: Head commit SHA
         repo_path: Path to the Git repository (default: current directory)
+        detect_renames: Whether to report renames, or a deletion plus an addition instead
 
     Returns:
-        dictionary with files categorized by change type (A: added, M: modified, D: deleted, R: renamed)
+        FilesByStatus dictionary with files categorized by change type
 
     Raises:
         subprocess.CalledProcessError: If the git command fails
     """
-    # Default to current directory if no repo path provided
-    if not repo_path:
-        repo_path = os.getcwd()
-
-    # Execute git command to get name-status diff
-    cmd = ["git", "diff", "--name-status", f"{base_sha}...{head_sha}"]
-
-    result = subprocess.run(cmd, cwd=repo_path, capture_output=True, text=True, check=True)
+    # Identical commits (e.g. re-runs or empty pushes) have no changes, so git is not needed
+    if base_sha == head_sha:
+        return {"added": [], "modified": [], "removed": [], "renamed": []}
+
+    # Execute git command to get name-status diff.
+    # With -z paths are printed verbatim (no quoting) and every field is terminated by a NUL,
+    # so paths containing tabs or newlines are parsed correctly.
+    cmd = ["git", "diff", "-z", "--name-status", f"{base_sha}...{head_sha}"]
+    if not detect_renames:
+        # Rename detection compares every deleted file with every added one, which is slow on
+        # large diffs; without it renames are reported as a deletion plus an addition
+        cmd.insert(-1, "--no-renames")
+
+    # An empty repo path means the current directory, which git inherits when cwd is None.
+    # Output is captured as bytes: text mode translates universal newlines, which would rewrite
+    # a carriage return inside a path.
+    result = subprocess.run(cmd, cwd=repo_path or None, capture_output=True)
+    if result.returncode:
+        raise subprocess.CalledProcessError(
+            result.returncode,
+            cmd,
+            result.stdout.decode(errors="replace"),
+            result.stderr.decode(errors="replace"),
+        )
 
     # Parse the output and categorize files
-    changes: dict[str, list[str]] = {
-        "A": [],  # Added
-        "M": [],  # Modified
-        "D": [],  # Deleted
-        "R": [],  # Renamed
-    }
-
-    for line in result.stdout.splitlines():
-        if not line.strip():
+    added: list[str] = []
+    modified: list[str] = []
+    removed: list[str] = []
+    renamed: list[dict[str, str]] = []
+    appenders = {"A": added.append, "M": modified.append, "D": removed.append}
+
+    # Each entry is a status field followed by one path, or two (old and new) for renames and copies
+    fields = iter(result.stdout.decode().split("\0"))
+    for status in fields:
+        if not status:
+            continue
+
+        kind = status[0]
+        if kind == "R" or kind == "C":
+            old_path = next(fields)
+            new_path = next(fields)
+            if kind == "R":
+                renamed.append({"old": old_path, "new": new_path})
             continue
 
-        parts = line.split("\t")
-        status = parts[0]
+        path = next(fields)
+        append = appenders.get(kind)
+        if append is not None:
+            append(path)
+
+    return {"added": added, "modified": modified, "removed": removed, "renamed": renamed}
+
+
+def _rev_parse(*revisions: str) -> str:
+    """
+    Resolve revisions to commit SHAs with git rev-parse.
+
+    Only stdout is captured; callers fall back or raise on failure without git's message, so stderr
+    is discarded rather than piped.
+
+    Args:
+        *revisions: Revisions to resolve
+
+    Returns:
+        The resolved SHAs, one per line
+
+    Raises:
+        subprocess.CalledProcessError: If any revision cannot be resolved
+    """
+    result = subprocess.run(
+        ["git", "rev-parse", *revisions],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def _resolve_base_sha() -> str:
+    """
+    Resolve the base SHA from GITHUB_BEFORE, falling back to the parent of HEAD.
+
+    Returns:
+        The base commit SHA, or the Git empty tree if HEAD has no parent
+    """
+    base_sha = os.environ.get("GITHUB_BEFORE", "")
+
+    # For the first push to a new branch, GITHUB_BEFORE will be all zeros
+    if base_sha and base_sha != _NULL_SHA:
+        return base_sha
+
+    # In this case, we need to find the common ancestor or use HEAD~1
+    try:
+        return _rev_parse("HEAD~1")
+    except subprocess.CalledProcessError:
+        # If this is the first commit, there is no previous commit
+        # We'll use a special Git empty tree object as the base
+        return _EMPTY_TREE_SHA
+
+
+def _resolve_head_sha() -> str:
+    """
+    Resolve the head SHA from GITHUB_AFTER, falling back to the current HEAD.
+
+    Returns:
+        The head commit SHA
 
-        # Handle regular changes (added, modified, deleted)
-        if status.startswith("A"):
-            changes["A"].append(parts[1])
-        elif status.startswith("M"):
-            changes["M"].append(parts[1])
-        elif status.startswith("D"):
-            changes["D"].append(parts[1])
-        elif status.startswith("R"):
-            # For renamed files, the format is R{score}\t{old_path}\t{new_path}
-            changes["R"].append(f"{parts[1]}\t{parts[2]}")
+    Raises:
+        ValueError: If HEAD cannot be resolved
+    """
+    head_sha = os.environ.get("GITHUB_AFTER", "")
+    if head_sha:
+        return head_sha
 
-    return changes
+    # If GITHUB_AFTER is not available, use the current HEAD
+    try:
+        return _rev_parse("HEAD")
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to determine HEAD SHA: {e}") from e
 
 
 def parse_git_shas_from_env() -> tuple[str, str]:
@@ -76,26 +171,18 @@ def parse_git_shas_from_env() -> tuple[str, str]:
     base_sha = os.environ.get("GITHUB_BEFORE", "")
     head_sha = os.environ.get("GITHUB_AFTER", "")
 
-    if not base_sha or base_sha == "0000000000000000000000000000000000000000":
-        # For the first push to a new branch, GITHUB_BEFORE will be all zeros
-        # In this case, we need to find the common ancestor or use HEAD~1
-        try:
-            result = subprocess.run(["git", "rev-parse", "HEAD~1"], capture_output=True, text=True, check=True)
-            base_sha = result.stdout.strip()
-        except subprocess.CalledProcessError:
-            # If this is the first commit, there is no previous commit
-            # We'll use a special Git empty tree object as the base
-            base_sha = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"  # Git empty tree
+    if base_sha == _NULL_SHA:
+        base_sha = ""
 
-    if not head_sha:
-        # If GITHUB_AFTER is not available, use the current HEAD
+    if not base_sha and not head_sha:
+        # Resolve both commits with a single git process
         try:
-            result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
-            head_sha = result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            raise ValueError(f"Failed to determine HEAD SHA: {e}") from e
+            head_sha, _, base_sha = _rev_parse("HEAD", "HEAD~1").partition("\n")
+        except subprocess.CalledProcessError:
+            # HEAD~1 does not exist on the first commit; HEAD is resolved on its own below
+            base_sha = _EMPTY_TREE_SHA
 
-    return (base_sha, head_sha)
+    return (base_sha or _resolve_base_sha(), head_sha or _resolve_head_sha())
 
 
 def get_push_changed_files(
@@ -103,6 +190,7 @@ def get_push_changed_files(
     head_sha: str | None = None,
     repo_path: str | None = None,
     patterns: list[str] | None = None,
+    detect_renames: bool = True,
 ) -> FilesByStatus | None:
     """
     Get and categorize changed files from a push event.
@@ -112,6 +200,7 @@ def get_push_changed_files(
         head_sha: Optional head SHA override (uses GITHUB_AFTER if not provided)
         repo_path: Path to the Git repository (default: current directory)
         patterns: list of glob patterns to filter files by
+        detect_renames: Whether to report renames, or a deletion plus an addition instead
 
     Returns:
         FilesByStatus dictionary with files categorized by status or None on error
@@ -122,42 +211,28 @@ def get_push_changed_files(
     """
     try:
         # If SHAs aren't explicitly provided, get them from environment
-        if not base_sha or not head_sha:
-            parsed_base_sha, parsed_head_sha = parse_git_shas_from_env()
-            base_sha = base_sha or parsed_base_sha
-            head_sha = head_sha or parsed_head_sha
+        if not base_sha and not head_sha:
+            base_sha, head_sha = parse_git_shas_from_env()
+        else:
+            # Only resolve the SHA that was not supplied
+            base_sha = base_sha or _resolve_base_sha()
+            head_sha = head_sha or _resolve_head_sha()
 
         print(f"Comparing changes between {base_sha} and {head_sha}")
 
         # Get changed files from git
-        changes = get_changed_files_from_git(base_sha, head_sha, repo_path)
-
-        # Convert to FilesByStatus format
-        file_changes: FilesByStatus = {
-            "added": changes["A"],
-            "modified": changes["M"],
-            "removed": changes["D"],
-            "renamed": [],
-        }
-
-        # Process renamed files
-        for renamed_path in changes["R"]:
-            old_path, new_path = renamed_path.split("\t")
-            file_changes["renamed"].append({"old": old_path, "new": new_path})
+        file_changes = get_changed_files_from_git(base_sha, head_sha, repo_path, detect_renames)
 
         return filter_files_by_patterns(file_changes, patterns)
 
     except subprocess.CalledProcessError as e:
-        print(f"Error executing Git command: {e}")
-        print(f"STDOUT: {e.stdout}")
-        print(f"STDERR: {e.stderr}")
+        # Report the failure with a single write
+        print(f"Error executing Git command: {e}\nSTDOUT: {e.stdout}\nSTDERR: {e.stderr}")
         return None
     except ValueError as e:
         print(f"Error determining commit SHAs: {e}")
         return None
     except Exception as e:
         print(f"Error processing changed files: {str(e)}")
-        import traceback
-
         print(traceback.format_exc())
         return None
@@ -1,20 +1,17 @@
 """Pytest configuration file for GitHub Action tests."""
 
 import json
-import os
 from pathlib import Path
-from typing import Any, Callable, Dict, Generator, List, TypedDict, TYPE_CHECKING
+from typing import Any, Dict, Generator, List, TypedDict, TYPE_CHECKING
 
 import pytest
 
+from main import get_event_type
+from pr_events import get_pr_number_from_event
 from utils import FilesByStatus
 
 if TYPE_CHECKING:
-    from _pytest.capture import CaptureFixture
-    from _pytest.fixtures import FixtureRequest
-    from _pytest.logging import LogCaptureFixture
     from _pytest.monkeypatch import MonkeyPatch
-    from pytest_mock.plugin import MockerFixture
 
 
 class GitHubEnv(TypedDict, total=False):
@@ -38,29 +35,74 @@ class GitHubEnv(TypedDict, total=False):
     INPUT_HEAD_SHA: str
 
 
+def _write_event(event_path: Path, event_data: Dict[str, Any]) -> None:
+    """
+    Write an event payload as compact JSON in a single write.
+
+    Args:
+        event_path: Path of the event payload file
+        event_data: Event payload to write
+    """
+    event_path.write_text(json.dumps(event_data, separators=(",", ":")), encoding="utf-8")
+
+
+@pytest.fixture(autouse=True)
+def clear_event_caches() -> Generator[None, None, None]:
+    """
+    Clear the memoized event context so each test sees its own environment.
+
+    Yields:
+        None
+    """
+    for cached in (get_event_type, get_pr_number_from_event):
+        cached.cache_clear()
+    yield
+    for cached in (get_event_type, get_pr_number_from_event):
+        cached.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def github_files(tmp_path_factory: pytest.TempPathFactory) -> Dict[str, Path]:
+    """
+    Create the files GitHub Actions would normally provide, once per test session.
+
+    Args:
+        tmp_path_factory: Session-scoped temporary directory factory
+
+    Returns:
+        Dictionary mapping each file name to its path
+    """
+    base_path = tmp_path_factory.mktemp("github")
+    names = ("github_output", "github_env", "github_path", "github_state", "step_summary", "event.json")
+    return {name: base_path / name for name in names}
+
+
 @pytest.fixture
-def temp_github_env(monkeypatch: "MonkeyPatch", tmp_path: Path) -> Generator[GitHubEnv, None, None]:
+def temp_github_env(monkeypatch: "MonkeyPatch", github_files: Dict[str, Path]) -> Generator[GitHubEnv, None, None]:
     """
     Set up a temporary GitHub Actions environment.
 
+    The files are shared across the session and reset to their initial state for each test.
+
     Args:
         monkeypatch: Pytest fixture for patching environment
-        tmp_path: Temporary directory path
+        github_files: Session-scoped GitHub Actions file paths
 
     Yields:
         Dictionary with set environment variables
     """
-    # Create temporary files that GitHub Actions would normally provide
-    github_output = tmp_path / "github_output"
-    github_output.touch()
+    # Empty the command files and remove any event payload written by a previous test
+    github_output = github_files["github_output"]
+    github_output.write_bytes(b"")
 
-    github_env = tmp_path / "github_env"
-    github_env.touch()
+    github_env = github_files["github_env"]
+    github_env.write_bytes(b"")
 
-    step_summary = tmp_path / "step_summary"
-    step_summary.touch()
+    step_summary = github_files["step_summary"]
+    step_summary.write_bytes(b"")
 
-    event_path = tmp_path / "event.json"
+    event_path = github_files["event.json"]
+    event_path.unlink(missing_ok=True)
 
     # Default environment setup
     env_vars: GitHubEnv = {
@@ -80,13 +122,13 @@ def temp_github_env(monkeypatch: "MonkeyPatch", tmp_path: Path) -> Generator[Git
 
 
 @pytest.fixture
-def pull_request_event(temp_github_env: GitHubEnv, tmp_path: Path) -> Dict[str, Any]:
+def pull_request_event(temp_github_env: GitHubEnv, github_files: Dict[str, Path]) -> Dict[str, Any]:
     """
     Create a mock pull request event.
 
     Args:
         temp_github_env: GitHub environment fixture
-        tmp_path: Temporary directory path
+        github_files: Session-scoped GitHub Actions file paths
 
     Returns:
         Dictionary representing the pull request event
@@ -100,21 +142,19 @@ def pull_request_event(temp_github_env: GitHubEnv, tmp_path: Path) -> Dict[str,
     }
 
     # Write event data to the event path
-    event_path = Path(temp_github_env["GITHUB_EVENT_PATH"])
-    with open(event_path, "w", encoding="utf-8") as f:
-        json.dump(event_data, f)
+    _write_event(github_files["event.json"], event_data)
 
     return event_data
 
 
 @pytest.fixture
-def push_event(temp_github_env: GitHubEnv, tmp_path: Path) -> Dict[str, Any]:
+def push_event(temp_github_env: GitHubEnv, github_files: Dict[str, Path]) -> Dict[str, Any]:
     """
     Create a mock push event.
 
     Args:
         temp_github_env: GitHub environment fixture
-        tmp_path: Temporary directory path
+        github_files: Session-scoped GitHub Actions file paths
 
     Returns:
         Dictionary representing the push event
@@ -129,17 +169,17 @@ def push_event(temp_github_env: GitHubEnv, tmp_path: Path) -> Dict[str, Any]:
     event_data = {"before": "before-sha-1234567890", "after": "after-sha-1234567890", "ref": "refs/heads/main"}
 
     # Write event data to the event path
-    event_path = Path(temp_github_env["GITHUB_EVENT_PATH"])
-    with open(event_path, "w", encoding="utf-8") as f:
-        json.dump(event_data, f)
+    _write_event(github_files["event.json"], event_data)
 
     return event_data
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_files_by_status() -> FilesByStatus:
     """
-    Create a sample FilesByStatus object for testing.
+    Create a sample FilesByStatus object for testing, once per test session.
+
+    Tests only read from it, so the same object is shared.
 
     Returns:
         FilesByStatus object with sample data
@@ -1,13 +1,13 @@
 """Tests for the GitHub Actions integration module."""
 
-from typing import Dict, List, Any, Optional, Type, Generator, TYPE_CHECKING
+from typing import Dict, List, TYPE_CHECKING
+import gc
 import json
 import os
+import re
 import sys
-import uuid
+import weakref
 from pathlib import Path
-from io import StringIO
-from unittest.mock import patch, mock_open
 
 import pytest
 
@@ -25,6 +25,9 @@ if TYPE_CHECKING:
     from _pytest.monkeypatch import MonkeyPatch
     from pytest_mock.plugin import MockerFixture
 
+# Extracts the heredoc delimiter from a key-value file command message
+_DELIM_RE = re.compile(r"<<([^\n]+)\n")
+
 
 class TestAnnotationProperties:
     """Tests for the AnnotationProperties class."""
@@ -102,57 +105,98 @@ class TestExitCode:
         assert ExitCode.FAILURE == 1
 
 
+def _reset_file(path: Path) -> Path:
+    """
+    Empty a session-scoped GitHub file so each test starts from a blank file.
+
+    Args:
+        path: Path of the file to reset
+
+    Returns:
+        The same path
+    """
+    path.write_bytes(b"")
+    return path
+
+
 @pytest.fixture
-def github_env_file(tmp_path: Path) -> Path:
+def github_env_file(github_files: Dict[str, Path]) -> Path:
     """
-    Create a mock GitHub environment file.
+    Provide an empty mock GitHub environment file.
 
     Args:
-        tmp_path: Pytest fixture for temporary directory
+        github_files: Session-scoped GitHub Actions file paths
 
     Returns:
         Path to the created environment file
     """
-    env_file = tmp_path / "github_env"
-    env_file.touch()
-    return env_file
+    return _reset_file(github_files["github_env"])
 
 
 @pytest.fixture
-def github_output_file(tmp_path: Path) -> Path:
+def github_output_file(github_files: Dict[str, Path]) -> Path:
     """
-    Create a mock GitHub output file.
+    Provide an empty mock GitHub output file.
 
     Args:
-        tmp_path: Pytest fixture for temporary directory
+        github_files: Session-scoped GitHub Actions file paths
 
     Returns:
         Path to the created output file
     """
-    output_file = tmp_path / "github_output"
-    output_file.touch()
-    return output_file
+    return _reset_file(github_files["github_output"])
 
 
 @pytest.fixture
-def github_step_summary_file(tmp_path: Path) -> Path:
+def github_path_file(github_files: Dict[str, Path]) -> Path:
     """
-    Create a mock GitHub step summary file.
+    Provide an empty mock GitHub path file.
 
     Args:
-        tmp_path: Pytest fixture for temporary directory
+        github_files: Session-scoped GitHub Actions file paths
+
+    Returns:
+        Path to the created path file
+    """
+    return _reset_file(github_files["github_path"])
+
+
+@pytest.fixture
+def github_state_file(github_files: Dict[str, Path]) -> Path:
+    """
+    Provide an empty mock GitHub state file.
+
+    Args:
+        github_files: Session-scoped GitHub Actions file paths
+
+    Returns:
+        Path to the created state file
+    """
+    return _reset_file(github_files["github_state"])
+
+
+@pytest.fixture
+def github_step_summary_file(github_files: Dict[str, Path]) -> Path:
+    """
+    Provide an empty mock GitHub step summary file.
+
+    Args:
+        github_files: Session-scoped GitHub Actions file paths
 
     Returns:
         Path to the created summary file
     """
-    summary_file = tmp_path / "step_summary"
-    summary_file.touch()
-    return summary_file
+    return _reset_file(github_files["step_summary"])
 
 
 @pytest.fixture
 def mock_github_files(
-    github_env_file: Path, github_output_file: Path, github_step_summary_file: Path, monkeypatch: "MonkeyPatch"
+    github_env_file: Path,
+    github_output_file: Path,
+    github_path_file: Path,
+    github_state_file: Path,
+    github_step_summary_file: Path,
+    monkeypatch: "MonkeyPatch",
 ) -> None:
     """
     Set up GitHub environment with mock files.
@@ -160,29 +204,70 @@ def mock_github_files(
     Args:
         github_env_file: Path to mocked env file
         github_output_file: Path to mocked output file
+        github_path_file: Path to mocked path file
+        github_state_file: Path to mocked state file
         github_step_summary_file: Path to mocked summary file
         monkeypatch: Pytest monkeypatch fixture
     """
     monkeypatch.setenv("GITHUB_ENV", str(github_env_file))
     monkeypatch.setenv("GITHUB_OUTPUT", str(github_output_file))
+    monkeypatch.setenv("GITHUB_PATH", str(github_path_file))
+    monkeypatch.setenv("GITHUB_STATE", str(github_state_file))
     monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(github_step_summary_file))
 
 
+@pytest.fixture(scope="module")
+def action() -> GitHubAction:
+    """
+    Create a GitHubAction shared by tests that only read inputs or print commands.
+
+    Tests that issue file commands build their own instance, since it caches file paths
+    and buffers commands.
+
+    Returns:
+        Shared GitHubAction instance
+    """
+    return GitHubAction()
+
+
+@pytest.fixture(scope="session")
+def full_props() -> AnnotationProperties:
+    """
+    Create annotation properties with every field set.
+
+    Returns:
+        Shared AnnotationProperties instance
+    """
+    return AnnotationProperties(
+        title="Title", file="file.py", start_line="10", end_line="20", start_column="5", end_column="15"
+    )
+
+
+@pytest.fixture(scope="session")
+def partial_props() -> AnnotationProperties:
+    """
+    Create annotation properties with only the title and file set.
+
+    Returns:
+        Shared AnnotationProperties instance
+    """
+    return AnnotationProperties(title="Title", file="file.py")
+
+
 class TestGitHubAction:
     """Test suite for the GitHubAction class."""
 
-    def test_get_env_success(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_env_success(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test successful retrieval of environment variables.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         # Set a test environment variable
         monkeypatch.setenv("TEST_ENV_VAR", "test_value")
 
-        action = GitHubAction()
-
         # Test with default options
         value = action.get_env("TEST_ENV_VAR")
         assert value == "test_value"
@@ -191,18 +276,17 @@ class TestGitHubAction:
         value = action.get_env("TEST_ENV_VAR", EnvOptions(required=True))
         assert value == "test_value"
 
-    def test_get_env_not_set(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_env_not_set(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test getting non-existent environment variable.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         # Ensure the environment variable doesn't exist
         monkeypatch.delenv("TEST_ENV_VAR", raising=False)
 
-        action = GitHubAction()
-
         # Test with default options (not required)
         value = action.get_env("TEST_ENV_VAR")
         assert value == ""
@@ -215,18 +299,17 @@ class TestGitHubAction:
         with pytest.raises(ValueError, match="Environment variable required and not supplied"):
             action.get_env("TEST_ENV_VAR", EnvOptions(required=True))
 
-    def test_get_env_trim_whitespace(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_env_trim_whitespace(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test whitespace trimming in environment variables.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         # Set environment variable with whitespace
         monkeypatch.setenv("TEST_ENV_VAR", "  value_with_whitespace  ")
 
-        action = GitHubAction()
-
         # Test with default options (trim enabled)
         value = action.get_env("TEST_ENV_VAR")
         assert value == "value_with_whitespace"
@@ -235,17 +318,17 @@ class TestGitHubAction:
         value = action.get_env("TEST_ENV_VAR", EnvOptions(trim_whitespace=False))
         assert value == "  value_with_whitespace  "
 
-    def test_get_input_success(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_input_success(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test getting action inputs.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         # Set an input environment variable
         monkeypatch.setenv("INPUT_TEST_INPUT", "input_value")
 
-        action = GitHubAction()
         value = action.get_input("test_input")
 
         assert value == "input_value"
@@ -259,18 +342,17 @@ class TestGitHubAction:
         value = action.get_input("test space input")
         assert value == "space_value"
 
-    def test_get_input_required(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_input_required(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test getting required action inputs.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         # Ensure input doesn't exist
         monkeypatch.delenv("INPUT_REQUIRED_INPUT", raising=False)
 
-        action = GitHubAction()
-
         # Should raise error if required and not set
         with pytest.raises(ValueError, match="Input required and not supplied"):
             action.get_input("required_input", InputOptions(required=True))
@@ -279,17 +361,16 @@ class TestGitHubAction:
         value = action.get_input("required_input")
         assert value == ""
 
-    def test_get_input_whitespace(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_input_whitespace(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test trimming whitespace in inputs.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         monkeypatch.setenv("INPUT_WHITESPACE_INPUT", "  input with whitespace  ")
 
-        action = GitHubAction()
-
         # Test with default options (trim enabled)
         value = action.get_input("whitespace_input")
         assert value == "input with whitespace"
@@ -298,17 +379,17 @@ class TestGitHubAction:
         value = action.get_input("whitespace_input", InputOptions(trim_whitespace=False))
         assert value == "  input with whitespace  "
 
-    def test_get_multiline_input(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_multiline_input(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test getting multiline inputs.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         # Set a multiline input
         monkeypatch.setenv("INPUT_MULTILINE_INPUT", "line1\nline2\n\nline3")
 
-        action = GitHubAction()
         values = action.get_multiline_input("multiline_input")
 
         assert values == ["line1", "line2", "line3"]
@@ -317,127 +398,103 @@ class TestGitHubAction:
         values = action.get_multiline_input("multiline_input", InputOptions(trim_whitespace=False))
         assert values == ["line1", "line2", "line3"]  # Empty lines are still filtered
 
-    def test_get_multiline_input_empty(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_multiline_input_empty(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test getting empty multiline inputs.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         # Set an empty input
         monkeypatch.setenv("INPUT_EMPTY_MULTILINE", "")
 
-        action = GitHubAction()
         values = action.get_multiline_input("empty_multiline")
 
         assert values == []
 
-    def test_get_boolean_input_true_variations(self, monkeypatch: "MonkeyPatch") -> None:
-        """
-        Test getting boolean inputs with various true values.
-
-        Args:
-            monkeypatch: Pytest monkeypatch fixture
-        """
-        action = GitHubAction()
-
-        # Test different true values
-        for true_value in ["true", "True", "TRUE"]:
-            monkeypatch.setenv("INPUT_BOOL_INPUT", true_value)
-            result = action.get_boolean_input("bool_input")
-            assert result is True
-
-    def test_get_boolean_input_false_variations(self, monkeypatch: "MonkeyPatch") -> None:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("true", True), ("True", True), ("TRUE", True), ("false", False), ("False", False), ("FALSE", False)],
+    )
+    def test_get_boolean_input(
+        self, action: GitHubAction, monkeypatch: "MonkeyPatch", value: str, expected: bool
+    ) -> None:
         """
-        Test getting boolean inputs with various false values.
+        Test getting boolean inputs with the accepted true and false spellings.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
+            value: Raw input value
+            expected: Expected boolean result
         """
-        action = GitHubAction()
+        monkeypatch.setenv("INPUT_BOOL_INPUT", value)
 
-        # Test different false values
-        for false_value in ["false", "False", "FALSE"]:
-            monkeypatch.setenv("INPUT_BOOL_INPUT", false_value)
-            result = action.get_boolean_input("bool_input")
-            assert result is False
+        assert action.get_boolean_input("bool_input") is expected
 
-    def test_get_boolean_input_invalid(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_boolean_input_invalid(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test error handling with invalid boolean inputs.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         monkeypatch.setenv("INPUT_BOOL_INPUT", "not_a_boolean")
 
-        action = GitHubAction()
-
         with pytest.raises(TypeError, match="Input does not meet YAML 1.2 'Core Schema' specification"):
             action.get_boolean_input("bool_input")
 
-    def test_export_variable_file_command(self, mock_github_files: None) -> None:
+    def test_export_variable_file_command(self, mock_github_files: None, github_env_file: Path) -> None:
         """
         Test exporting environment variables using file commands.
 
         Args:
             mock_github_files: Fixture for GitHub files
+            github_env_file: Path to the mocked environment file
         """
         action = GitHubAction()
         action.export_variable("TEST_VAR", "test_value")
+        action.flush_file_commands()
 
         # Verify environment variable was set
         assert os.environ.get("TEST_VAR") == "test_value"
 
         # Verify file command was issued
-        env_file = os.environ.get("GITHUB_ENV")
-        with open(env_file, "r") as f:
-            content = f.read()
-            assert "TEST_VAR<<" in content
-            assert "test_value" in content
+        content = github_env_file.read_text()
+        assert "TEST_VAR<<" in content
+        assert "test_value" in content
 
-    def test_export_variable_complex_value(self, mock_github_files: None) -> None:
+    def test_export_variable_complex_value(self, mock_github_files: None, github_env_file: Path) -> None:
         """
         Test exporting complex values (non-strings) as environment variables.
 
         Args:
             mock_github_files: Fixture for GitHub files
+            github_env_file: Path to the mocked environment file
         """
         action = GitHubAction()
         complex_value = {"key": "value", "nested": {"data": [1, 2, 3]}}
 
         action.export_variable("COMPLEX_VAR", complex_value)
+        action.flush_file_commands()
 
         # Verify environment variable was JSON encoded
         assert os.environ.get("COMPLEX_VAR") == json.dumps(complex_value)
 
         # Verify file command was issued with JSON value
-        env_file = os.environ.get("GITHUB_ENV")
-        with open(env_file, "r") as f:
-            content = f.read()
-            assert "COMPLEX_VAR<<" in content
-            assert json.dumps(complex_value) in content
-
-    def test_set_secret(self, capsys: "CaptureFixture[str]") -> None:
-        """
-        Test registering a secret.
+        content = github_env_file.read_text()
+        assert "COMPLEX_VAR<<" in content
+        assert json.dumps(complex_value) in content
 
-        Args:
-            capsys: Pytest capture fixture
-        """
-        action = GitHubAction()
-        action.set_secret("super_secret_value")
-
-        # Verify command was issued
-        captured = capsys.readouterr()
-        assert "::add-mask::super_secret_value" in captured.out
-
-    def test_add_path(self, mock_github_files: None, monkeypatch: "MonkeyPatch") -> None:
+    def test_add_path(self, mock_github_files: None, github_path_file: Path, monkeypatch: "MonkeyPatch") -> None:
         """
         Test adding a path to PATH environment variable.
 
         Args:
             mock_github_files: Fixture for GitHub files
+            github_path_file: Path to the mocked path file
             monkeypatch: Pytest monkeypatch fixture
         """
         # Set initial PATH
@@ -445,61 +502,59 @@ class TestGitHubAction:
 
         action = GitHubAction()
         action.add_path("/new/path")
+        action.flush_file_commands()
 
         # Verify PATH was updated
         assert os.environ.get("PATH") == "/new/path:/existing/path"
 
         # Verify file command was issued
-        path_file = os.environ.get("GITHUB_PATH")
-        with open(path_file, "r") as f:
-            content = f.read()
-            assert "/new/path" in content
+        content = github_path_file.read_text()
+        assert "/new/path" in content
 
-    def test_set_output_file_command(self, mock_github_files: None) -> None:
+    def test_set_output_file_command(self, mock_github_files: None, github_output_file: Path) -> None:
         """
         Test setting action outputs using file commands.
 
         Args:
             mock_github_files: Fixture for GitHub files
+            github_output_file: Path to the mocked output file
         """
         action = GitHubAction()
         action.set_output("test-output", "output_value")
+        action.flush_file_commands()
 
         # Verify file command was issued
-        output_file = os.environ.get("GITHUB_OUTPUT")
-        with open(output_file, "r") as f:
-            content = f.read()
-            assert "test-output<<" in content
-            assert "output_value" in content
+        content = github_output_file.read_text()
+        assert "test-output<<" in content
+        assert "output_value" in content
 
-    def test_set_output_complex_value(self, mock_github_files: None) -> None:
+    def test_set_output_complex_value(self, mock_github_files: None, github_output_file: Path) -> None:
         """
         Test setting complex values (non-strings) as outputs.
 
         Args:
             mock_github_files: Fixture for GitHub files
+            github_output_file: Path to the mocked output file
         """
         action = GitHubAction()
         complex_value = {"result": True, "data": [1, 2, 3]}
 
         action.set_output("complex-output", complex_value)
+        action.flush_file_commands()
 
         # Verify file command was issued with JSON value
-        output_file = os.environ.get("GITHUB_OUTPUT")
-        with open(output_file, "r") as f:
-            content = f.read()
-            assert "complex-output<<" in content
-            assert json.dumps(complex_value) in content
+        content = github_output_file.read_text()
+        assert "complex-output<<" in content
+        assert json.dumps(complex_value) in content
 
-    def test_set_command_echo(self, capsys: "CaptureFixture[str]") -> None:
+    def test_set_command_echo(self, action: GitHubAction, capsys: "CaptureFixture[str]") -> None:
         """
         Test setting command echo.
 
         Args:
+            action: Shared GitHubAction instance
             capsys: Pytest capture fixture
         """
-        action = GitHubAction()
-
         # Enable echo
         action.set_command_echo(True)
         captured = capsys.readouterr()
@@ -510,18 +565,18 @@ class TestGitHubAction:
         captured = capsys.readouterr()
         assert "::echo::off" in captured.out
 
-    def test_set_failed(self, capsys: "CaptureFixture[str]", mocker: "MockerFixture") -> None:
+    def test_set_failed(self, action: GitHubAction, capsys: "CaptureFixture[str]", monkeypatch: "MonkeyPatch") -> None:
         """
         Test setting action as failed.
 
         Args:
+            action: Shared GitHubAction instance
             capsys: Pytest capture fixture
-            mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
-        # Mock sys.exit to prevent actual exit
-        mock_exit = mocker.patch("sys.exit")
-
-        action = GitHubAction()
+        # Record exit codes instead of exiting
+        exit_calls: List[int] = []
+        monkeypatch.setattr(sys, "exit", exit_calls.append)
 
         # Test with string message
         action.set_failed("Failure message")
@@ -531,10 +586,10 @@ class TestGitHubAction:
         assert "::error::Failure message" in captured.out
 
         # Verify exit was called with failure code
-        mock_exit.assert_called_with(ExitCode.FAILURE)
+        assert exit_calls == [ExitCode.FAILURE]
 
         # Test with exception
-        mock_exit.reset_mock()
+        exit_calls.clear()
         exception = RuntimeError("Exception message")
         action.set_failed(exception)
 
@@ -543,17 +598,16 @@ class TestGitHubAction:
         assert "::error::Exception message" in captured.out
 
         # Verify exit was called with failure code
-        mock_exit.assert_called_with(ExitCode.FAILURE)
+        assert exit_calls == [ExitCode.FAILURE]
 
-    def test_is_debug(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_is_debug(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test checking debug mode.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
-        action = GitHubAction()
-
         # Test when debug is enabled
         monkeypatch.setenv("RUNNER_DEBUG", "1")
         assert action.is_debug() is True
@@ -566,165 +620,100 @@ class TestGitHubAction:
         monkeypatch.delenv("RUNNER_DEBUG", raising=False)
         assert action.is_debug() is False
 
-    def test_debug(self, capsys: "CaptureFixture[str]") -> None:
-        """
-        Test sending debug messages.
+    @pytest.mark.parametrize(
+        "method, message, expected",
+        [
+            ("set_secret", "super_secret_value", "::add-mask::super_secret_value"),
+            ("debug", "Debug message", "::debug::Debug message"),
+            ("error", "Error message", "::error::Error message"),
+            ("error", ValueError("Exception error"), "::error::Exception error"),
+            ("warning", "Warning message", "::warning::Warning message"),
+            ("warning", RuntimeError("Warning exception"), "::warning::Warning exception"),
+            ("notice", "Notice message", "::notice::Notice message"),
+            ("notice", RuntimeError("Notice exception"), "::notice::Notice exception"),
+            ("info", "Info message", "Info message"),
+        ],
+    )
+    def test_output_command(
+        self,
+        action: GitHubAction,
+        capsys: "CaptureFixture[str]",
+        method: str,
+        message: str | Exception,
+        expected: str,
+    ) -> None:
+        """
+        Test the methods that print a workflow command or message.
 
         Args:
+            action: Shared GitHubAction instance
             capsys: Pytest capture fixture
+            method: Name of the GitHubAction method to call
+            message: Message or exception passed to the method
+            expected: Text expected in the printed output
         """
-        action = GitHubAction()
-        action.debug("Debug message")
+        getattr(action, method)(message)
 
-        # Verify debug command was issued
         captured = capsys.readouterr()
-        assert "::debug::Debug message" in captured.out
+        assert expected in captured.out
 
-    def test_error(self, capsys: "CaptureFixture[str]") -> None:
-        """
-        Test sending error messages.
-
-        Args:
-            capsys: Pytest capture fixture
-        """
-        action = GitHubAction()
-
-        # Test with string message
-        action.error("Error message")
-
-        # Verify error command was issued
-        captured = capsys.readouterr()
-        assert "::error::Error message" in captured.out
-
-        # Test with exception
-        exception = ValueError("Exception error")
-        action.error(exception)
-
-        # Verify error command includes exception message
-        captured = capsys.readouterr()
-        assert "::error::Exception error" in captured.out
-
-    def test_error_with_properties(self, capsys: "CaptureFixture[str]") -> None:
+    def test_error_with_properties(
+        self, action: GitHubAction, full_props: AnnotationProperties, capsys: "CaptureFixture[str]"
+    ) -> None:
         """
         Test sending error with annotation properties.
 
         Args:
+            action: Shared GitHubAction instance
+            full_props: Annotation properties with every field set
             capsys: Pytest capture fixture
         """
-        action = GitHubAction()
-
-        # Create properties
-        props = AnnotationProperties(
-            title="Error Title", file="file.py", start_line="10", end_line="20", start_column="5", end_column="15"
-        )
-
-        action.error("Error with properties", props)
+        action.error("Error with properties", full_props)
 
         # Verify error command includes all properties
         captured = capsys.readouterr()
         cmd = captured.out.strip()
-        assert "::error" in cmd
-        assert "title=Error Title" in cmd
-        assert "file=file.py" in cmd
-        assert "line=10" in cmd
-        assert "endLine=20" in cmd
-        assert "col=5" in cmd
-        assert "endColumn=15" in cmd
-        assert "::Error with properties" in cmd
-
-    def test_warning(self, capsys: "CaptureFixture[str]") -> None:
-        """
-        Test sending warning messages.
-
-        Args:
-            capsys: Pytest capture fixture
-        """
-        action = GitHubAction()
-
-        # Test with string message
-        action.warning("Warning message")
-
-        # Verify warning command was issued
-        captured = capsys.readouterr()
-        assert "::warning::Warning message" in captured.out
-
-        # Test with exception
-        exception = RuntimeError("Warning exception")
-        action.warning(exception)
-
-        # Verify warning command includes exception message
-        captured = capsys.readouterr()
-        assert "::warning::Warning exception" in captured.out
+        expected = [
+            "::error",
+            "title=Title",
+            "file=file.py",
+            "line=10",
+            "endLine=20",
+            "col=5",
+            "endColumn=15",
+            "::Error with properties",
+        ]
+        missing = [part for part in expected if part not in cmd]
+        assert not missing, missing
 
-    def test_warning_with_properties(self, capsys: "CaptureFixture[str]") -> None:
+    def test_warning_with_properties(
+        self, action: GitHubAction, partial_props: AnnotationProperties, capsys: "CaptureFixture[str]"
+    ) -> None:
         """
         Test sending warning with annotation properties.
 
         Args:
+            action: Shared GitHubAction instance
+            partial_props: Annotation properties with only some fields set
             capsys: Pytest capture fixture
         """
-        action = GitHubAction()
-
-        # Create properties with only some fields
-        props = AnnotationProperties(title="Warning", file="script.js")
-
-        action.warning("Warning with properties", props)
+        action.warning("Warning with properties", partial_props)
 
         # Verify warning command includes provided properties
         captured = capsys.readouterr()
         cmd = captured.out.strip()
-        assert "::warning" in cmd
-        assert "title=Warning" in cmd
-        assert "file=script.js" in cmd
-        assert "::Warning with properties" in cmd
-
-    def test_notice(self, capsys: "CaptureFixture[str]") -> None:
-        """
-        Test sending notice messages.
-
-        Args:
-            capsys: Pytest capture fixture
-        """
-        action = GitHubAction()
-
-        # Test with string message
-        action.notice("Notice message")
-
-        # Verify notice command was issued
-        captured = capsys.readouterr()
-        assert "::notice::Notice message" in captured.out
-
-        # Test with exception
-        exception = RuntimeError("Notice exception")
-        action.notice(exception)
-
-        # Verify notice command includes exception message
-        captured = capsys.readouterr()
-        assert "::notice::Notice exception" in captured.out
-
-    def test_info(self, capsys: "CaptureFixture[str]") -> None:
-        """
-        Test sending info messages.
-
-        Args:
-            capsys: Pytest capture fixture
-        """
-        action = GitHubAction()
-        action.info("Info message")
-
-        # Verify message was printed
-        captured = capsys.readouterr()
-        assert "Info message" in captured.out
+        expected = ["::warning", "title=Title", "file=file.py", "::Warning with properties"]
+        missing = [part for part in expected if part not in cmd]
+        assert not missing, missing
 
-    def test_group(self, capsys: "CaptureFixture[str]") -> None:
+    def test_group(self, action: GitHubAction, capsys: "CaptureFixture[str]") -> None:
         """
         Test grouping output.
 
         Args:
+            action: Shared GitHubAction instance
             capsys: Pytest capture fixture
         """
-        action = GitHubAction()
-
         # Define a function to execute within the group
         def test_fn() -> str:
             action.info("Message within group")
@@ -742,15 +731,14 @@ class TestGitHubAction:
         # Verify function result was returned
         assert result == "result"
 
-    def test_group_with_exception(self, capsys: "CaptureFixture[str]") -> None:
+    def test_group_with_exception(self, action: GitHubAction, capsys: "CaptureFixture[str]") -> None:
         """
         Test group handling when function raises exception.
 
         Args:
+            action: Shared GitHubAction instance
             capsys: Pytest capture fixture
         """
-        action = GitHubAction()
-
         # Define a function that raises an exception
         def failing_fn() -> None:
             action.info("Before exception")
@@ -766,41 +754,44 @@ class TestGitHubAction:
         assert "Before exception" in captured.out
         assert "::endgroup::" in captured.out
 
-    def test_save_state(self, mock_github_files: None) -> None:
+    def test_save_state(self, mock_github_files: None, github_state_file: Path) -> None:
         """
         Test saving state for current action.
 
         Args:
             mock_github_files: Fixture for GitHub files
+            github_state_file: Path to the mocked state file
         """
         action = GitHubAction()
         action.save_state("test-state", "state_value")
+        action.flush_file_commands()
 
         # Verify file command was issued
-        state_file = os.environ.get("GITHUB_STATE")
-        with open(state_file, "r") as f:
-            content = f.read()
-            assert "test-state<<" in content
-            assert "state_value" in content
+        content = github_state_file.read_text()
+        assert "test-state<<" in content
+        assert "state_value" in content
 
-    def test_get_state(self, monkeypatch: "MonkeyPatch") -> None:
+    def test_get_state(self, action: GitHubAction, monkeypatch: "MonkeyPatch") -> None:
         """
         Test getting state from environment.
 
         Args:
+            action: Shared GitHubAction instance
             monkeypatch: Pytest monkeypatch fixture
         """
         monkeypatch.setenv("STATE_TEST_STATE", "saved_value")
 
-        action = GitHubAction()
         value = action.get_state("TEST_STATE")
 
         assert value == "saved_value"
 
-    def test_command_value_conversion(self) -> None:
-        """Test _to_command_value method for different input types."""
-        action = GitHubAction()
+    def test_command_value_conversion(self, action: GitHubAction) -> None:
+        """
+        Test _to_command_value method for different input types.
 
+        Args:
+            action: Shared GitHubAction instance
+        """
         # Test with string
         assert action._to_command_value("string") == "string"
 
@@ -822,16 +813,18 @@ class TestGitHubAction:
         # Test with list
         assert action._to_command_value([1, 2, 3]) == "[1, 2, 3]"
 
-    def test_command_properties_conversion(self) -> None:
-        """Test _to_command_properties method for annotation properties."""
-        action = GitHubAction()
-
-        # Create properties with all fields
-        props = AnnotationProperties(
-            title="Title", file="file.py", start_line="10", end_line="20", start_column="5", end_column="15"
-        )
+    def test_command_properties_conversion(
+        self, action: GitHubAction, full_props: AnnotationProperties, partial_props: AnnotationProperties
+    ) -> None:
+        """
+        Test _to_command_properties method for annotation properties.
 
-        command_props = action._to_command_properties(props)
+        Args:
+            action: Shared GitHubAction instance
+            full_props: Annotation properties with every field set
+            partial_props: Annotation properties with only some fields set
+        """
+        command_props = action._to_command_properties(full_props)
 
         # Verify property mapping
         assert command_props["title"] == "Title"
@@ -841,10 +834,7 @@ class TestGitHubAction:
         assert command_props["col"] == "5"
         assert command_props["endColumn"] == "15"
 
-        # Create properties with only some fields
-        props_partial = AnnotationProperties(title="Title", file="file.py")
-
-        command_props = action._to_command_properties(props_partial)
+        command_props = action._to_command_properties(partial_props)
 
         # Verify only provided properties are included
         assert command_props["title"] == "Title"
@@ -854,52 +844,62 @@ class TestGitHubAction:
         assert "col" not in command_props
         assert "endColumn" not in command_props
 
-    def test_escape_data(self) -> None:
-        """Test _escape_data method for command values."""
-        action = GitHubAction()
-
-        # Test escaping % character
-        assert action._escape_data("50%") == "50%25"
-
-        # Test escaping newlines
-        assert action._escape_data("line1\nline2") == "line1%0Aline2"
-
-        # Test escaping carriage returns
-        assert action._escape_data("value\rreturn") == "value%0Dreturn"
-
-        # Test escaping complex string
-        assert action._escape_data("complex\r\n%value") == "complex%0D%0A%25value"
-
-    def test_escape_property(self) -> None:
-        """Test _escape_property method for command properties."""
-        action = GitHubAction()
-
-        # Test escaping % character
-        assert action._escape_property("50%") == "50%25"
-
-        # Test escaping newlines
-        assert action._escape_property("line1\nline2") == "line1%0Aline2"
-
-        # Test escaping carriage returns
-        assert action._escape_property("value\rreturn") == "value%0Dreturn"
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("50%", "50%25"),
+            ("line1\nline2", "line1%0Aline2"),
+            ("value\rreturn", "value%0Dreturn"),
+            ("complex\r\n%value", "complex%0D%0A%25value"),
+        ],
+    )
+    def test_escape_data(self, action: GitHubAction, value: str, expected: str) -> None:
+        """
+        Test _escape_data method for command values.
 
-        # Test escaping colons and commas (specific to properties)
-        assert action._escape_property("key:value,item") == "key%3Avalue%2Citem"
+        Args:
+            action: Shared GitHubAction instance
+            value: Raw command value
+            expected: Escaped command value
+        """
+        assert action._escape_data(value) == expected
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("50%", "50%25"),
+            ("line1\nline2", "line1%0Aline2"),
+            ("value\rreturn", "value%0Dreturn"),
+            # Colons and commas are only escaped in properties
+            ("key:value,item", "key%3Avalue%2Citem"),
+            ("complex\r\n%:,value", "complex%0D%0A%25%3A%2Cvalue"),
+        ],
+    )
+    def test_escape_property(self, action: GitHubAction, value: str, expected: str) -> None:
+        """
+        Test _escape_property method for command properties.
 
-        # Test escaping complex string
-        assert action._escape_property("complex\r\n%:,value") == "complex%0D%0A%25%3A%2Cvalue"
+        Args:
+            action: Shared GitHubAction instance
+            value: Raw property value
+            expected: Escaped property value
+        """
+        assert action._escape_property(value) == expected
 
-    def test_prepare_key_value_message(self) -> None:
-        """Test _prepare_key_value_message method for file commands."""
-        action = GitHubAction()
+    def test_prepare_key_value_message(self, action: GitHubAction) -> None:
+        """
+        Test _prepare_key_value_message method for file commands.
 
+        Args:
+            action: Shared GitHubAction instance
+        """
         # Test with string value
         message = action._prepare_key_value_message("key", "value")
 
         # Verify format is correct
         assert message.startswith("key<<ghadelimiter_")
         assert "value" in message
-        assert message.endswith("ghadelimiter_" + message.split("_")[1].split("\n")[0])
+        assert message.endswith(_DELIM_RE.search(message).group(1))
 
         # Test with complex value
         data = {"nested": {"array": [1, 2, 3]}}
@@ -908,25 +908,31 @@ class TestGitHubAction:
         assert message.startswith("complex_key<<ghadelimiter_")
         assert json.dumps(data) in message
 
-    def test_prepare_key_value_message_with_delimiter_in_key(self) -> None:
-        """Test error when delimiter appears in key."""
-        action = GitHubAction()
+    def test_prepare_key_value_message_with_delimiter_in_key(self, action: GitHubAction) -> None:
+        """
+        Test error when delimiter appears in key.
 
+        Args:
+            action: Shared GitHubAction instance
+        """
         # Get a delimiter by calling the method and extracting it
         temp_message = action._prepare_key_value_message("temp", "value")
-        delimiter = temp_message.split("<<")[1].split("\n")[0]
+        delimiter = _DELIM_RE.search(temp_message).group(1)
 
         # Test with delimiter in key
         with pytest.raises(ValueError, match="name should not contain the delimiter"):
             action._prepare_key_value_message(f"bad{delimiter}key", "value")
 
-    def test_prepare_key_value_message_with_delimiter_in_value(self) -> None:
-        """Test error when delimiter appears in value."""
-        action = GitHubAction()
+    def test_prepare_key_value_message_with_delimiter_in_value(self, action: GitHubAction) -> None:
+        """
+        Test error when delimiter appears in value.
 
+        Args:
+            action: Shared GitHubAction instance
+        """
         # Get a delimiter by calling the method and extracting it
         temp_message = action._prepare_key_value_message("temp", "value")
-        delimiter = temp_message.split("<<")[1].split("\n")[0]
+        delimiter = _DELIM_RE.search(temp_message).group(1)
 
         # Test with delimiter in value
         with pytest.raises(ValueError, match="value should not contain the delimiter"):
@@ -941,12 +947,75 @@ class TestGitHubAction:
         """
         action = GitHubAction()
         action._issue_file_command("OUTPUT", "test-output=test-value")
+        action.flush_file_commands()
 
         # Verify file was written to
-        output_file = os.environ.get("GITHUB_OUTPUT")
-        with open(output_file, "r") as f:
-            content = f.read()
-            assert "test-output=test-value" in content
+        output_file = Path(os.environ["GITHUB_OUTPUT"])
+        assert "test-output=test-value" in output_file.read_text()
+
+    def test_flush_file_commands(self, mock_github_files: None) -> None:
+        """
+        Test that file commands are buffered until flushed.
+
+        Args:
+            mock_github_files: Fixture for GitHub files
+        """
+        action = GitHubAction()
+        action.set_output("first", "1")
+        action.set_output("second", "2")
+
+        # Nothing is written before the flush
+        output_file = Path(os.environ["GITHUB_OUTPUT"])
+        assert output_file.read_text() == ""
+
+        action.flush_file_commands()
+
+        content = output_file.read_text()
+        assert "first<<" in content
+        assert "second<<" in content
+
+        # A second flush does not write the commands again
+        action.flush_file_commands()
+        assert output_file.read_text() == content
+
+    def test_pending_commands_written_when_collected(self, mock_github_files: None) -> None:
+        """
+        Test that pending commands are written when an unflushed instance is collected.
+
+        Args:
+            mock_github_files: Fixture for GitHub files
+        """
+
+        def set_pending_output() -> "weakref.ref[GitHubAction]":
+            action = GitHubAction()
+            action.set_output("pending", "1")
+            return weakref.ref(action)
+
+        action_ref = set_pending_output()
+        gc.collect()
+
+        assert action_ref() is None
+        content = Path(os.environ["GITHUB_OUTPUT"]).read_text()
+        assert "pending<<" in content
+        assert content.count("pending<<") == 1
+
+    def test_flushed_commands_not_rewritten_when_collected(self, mock_github_files: None) -> None:
+        """
+        Test that collecting a flushed instance does not write its commands again.
+
+        Args:
+            mock_github_files: Fixture for GitHub files
+        """
+        action = GitHubAction()
+        action.set_output("flushed", "1")
+        action.flush_file_commands()
+
+        output_file = Path(os.environ["GITHUB_OUTPUT"])
+        content = output_file.read_text()
+
+        del action
+        gc.collect()
+        assert output_file.read_text() == content
 
     def test_issue_file_command_missing_env(self, monkeypatch: "MonkeyPatch") -> None:
         """
@@ -975,8 +1044,10 @@ class TestGitHubAction:
 
         action = GitHubAction()
 
+        action._issue_file_command("OUTPUT", "test-output=test-value")
+
         with pytest.raises(FileNotFoundError, match="Missing file at path"):
-            action._issue_file_command("OUTPUT", "test-output=test-value")
+            action.flush_file_commands()
 
 
 class TestSummary:
@@ -987,7 +1058,7 @@ class TestSummary:
         action = GitHubAction()
         summary = action.summary
 
-        assert summary._buffer == ""
+        assert summary.stringify() == ""
         assert summary._file_path is None
         assert summary._gh is action
 
@@ -1041,8 +1112,12 @@ class TestSummary:
         action = GitHubAction()
         summary = action.summary
 
+        # Resolving the path does not touch the file
+        assert summary.file_path() == os.environ.get("GITHUB_STEP_SUMMARY")
+        mock_open.assert_not_called()
+
         with pytest.raises(IOError, match="Unable to access summary file"):
-            summary.file_path()
+            summary.write()
 
     def test_wrap(self) -> None:
         """Test _wrap method for creating HTML elements."""
@@ -1065,6 +1140,14 @@ class TestSummary:
         html = summary._wrap("img", None, {"src": "image.png", "alt": "Alt text"})
         assert html == '<img src="image.png" alt="Alt text">'
 
+    def test_wrap_simple(self) -> None:
+        """Test _wrap_simple method matches _wrap for tags without attributes."""
+        action = GitHubAction()
+        summary = action.summary
+
+        for tag in ["pre", "code", "details", "summary"]:
+            assert summary._wrap_simple(tag, "content") == summary._wrap(tag, "content")
+
     def test_write(self, mock_github_files: None) -> None:
         """
         Test writing summary to file.
@@ -1082,13 +1165,11 @@ class TestSummary:
         result = summary.write()
 
         # Verify file was written to
-        summary_file = os.environ.get("GITHUB_STEP_SUMMARY")
-        with open(summary_file, "r") as f:
-            content = f.read()
-            assert "Test content" in content
+        summary_file = Path(os.environ["GITHUB_STEP_SUMMARY"])
+        assert "Test content" in summary_file.read_text()
 
         # Verify buffer was emptied
-        assert summary._buffer == ""
+        assert summary.stringify() == ""
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1100,11 +1181,10 @@ class TestSummary:
         Args:
             mock_github_files: Fixture for GitHub files
         """
-        summary_file = os.environ.get("GITHUB_STEP_SUMMARY")
+        summary_file = Path(os.environ["GITHUB_STEP_SUMMARY"])
 
         # Write initial content to file
-        with open(summary_file, "w") as f:
-            f.write("Initial content")
+        summary_file.write_text("Initial content")
 
         action = GitHubAction()
         summary = action.summary
@@ -1114,10 +1194,9 @@ class TestSummary:
         summary.write({"overwrite": True})
 
         # Verify file was overwritten
-        with open(summary_file, "r") as f:
-            content = f.read()
-            assert "Initial content" not in content
-            assert "New content" in content
+        content = summary_file.read_text()
+        assert "Initial content" not in content
+        assert "New content" in content
 
     def test_clear(self, mock_github_files: None) -> None:
         """
@@ -1126,11 +1205,10 @@ class TestSummary:
         Args:
             mock_github_files: Fixture for GitHub files
         """
-        summary_file = os.environ.get("GITHUB_STEP_SUMMARY")
+        summary_file = Path(os.environ["GITHUB_STEP_SUMMARY"])
 
         # Write initial content to file
-        with open(summary_file, "w") as f:
-            f.write("Initial content")
+        summary_file.write_text("Initial content")
 
         action = GitHubAction()
         summary = action.summary
@@ -1139,9 +1217,7 @@ class TestSummary:
         result = summary.clear()
 
         # Verify file was cleared
-        with open(summary_file, "r") as f:
-            content = f.read()
-            assert content == ""
+        assert summary_file.read_text() == ""
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1181,13 +1257,13 @@ class TestSummary:
 
         # Add content
         summary.add_raw("Test content")
-        assert summary._buffer == "Test content"
+        assert summary.stringify() == "Test content"
 
         # Empty buffer
         result = summary.empty_buffer()
 
         # Verify buffer was emptied
-        assert summary._buffer == ""
+        assert summary.stringify() == ""
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1201,15 +1277,15 @@ class TestSummary:
         result = summary.add_raw("Test content")
 
         # Verify content was added
-        assert summary._buffer == "Test content"
+        assert summary.stringify() == "Test content"
 
         # Add more content without EOL
         summary.add_raw(" and more")
-        assert summary._buffer == "Test content and more"
+        assert summary.stringify() == "Test content and more"
 
         # Add content with EOL
         summary.add_raw(" with EOL", True)
-        assert summary._buffer == f"Test content and more with EOL{os.linesep}"
+        assert summary.stringify() == f"Test content and more with EOL{os.linesep}"
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1223,11 +1299,11 @@ class TestSummary:
         result = summary.add_eol()
 
         # Verify EOL was added
-        assert summary._buffer == os.linesep
+        assert summary.stringify() == os.linesep
 
         # Add content and EOL
         summary.add_raw("Line 1").add_eol().add_raw("Line 2")
-        assert summary._buffer == f"{os.linesep}Line 1{os.linesep}Line 2"
+        assert summary.stringify() == f"{os.linesep}Line 1{os.linesep}Line 2"
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1241,8 +1317,8 @@ class TestSummary:
         result = summary.add_code_block("const x = 5;")
 
         # Verify HTML was added
-        assert "<pre><code>const x = 5;</code></pre>" in summary._buffer
-        assert f"{os.linesep}" in summary._buffer
+        assert "<pre><code>const x = 5;</code></pre>" in summary.stringify()
+        assert f"{os.linesep}" in summary.stringify()
 
         # Clear buffer
         summary.empty_buffer()
@@ -1251,7 +1327,7 @@ class TestSummary:
         summary.add_code_block("def hello():\n    print('Hello')", "python")
 
         # Verify HTML with language attribute was added
-        assert '<pre lang="python"><code>def hello():' in summary._buffer
+        assert '<pre lang="python"><code>def hello():' in summary.stringify()
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1265,7 +1341,7 @@ class TestSummary:
         result = summary.add_list(["Item 1", "Item 2", "Item 3"])
 
         # Verify HTML was added
-        html = summary._buffer
+        html = summary.stringify()
         assert "<ul>" in html
         assert "<li>Item 1</li>" in html
         assert "<li>Item 2</li>" in html
@@ -1279,7 +1355,7 @@ class TestSummary:
         summary.add_list(["First", "Second", "Third"], ordered=True)
 
         # Verify HTML was added
-        html = summary._buffer
+        html = summary.stringify()
         assert "<ol>" in html
         assert "<li>First</li>" in html
         assert "<li>Second</li>" in html
@@ -1305,7 +1381,7 @@ class TestSummary:
         result = summary.add_table(rows)
 
         # Verify HTML was added
-        html = summary._buffer
+        html = summary.stringify()
         assert "<table>" in html
         assert "<tr>" in html
         assert "<th>Name</th>" in html
@@ -1336,10 +1412,22 @@ class TestSummary:
         summary.add_table(rows)
 
         # Verify HTML with colspan and rowspan was added
-        html = summary._buffer
+        html = summary.stringify()
         assert '<th colspan="2">Header</th>' in html
         assert '<td rowspan="2">Row 2, Col 1</td>' in html
 
+    def test_add_table_exact_markup(self) -> None:
+        """Test add_table renders the whole table as one line of markup."""
+        action = GitHubAction()
+        summary = action.summary
+
+        summary.add_table([[{"data": "File", "header": True}, "Status"], ["a.py", {"data": "added", "colspan": "2"}]])
+
+        assert summary.stringify() == (
+            "<table><tr><th>File</th><td>Status</td></tr>"
+            '<tr><td>a.py</td><td colspan="2">added</td></tr></table>' + os.linesep
+        )
+
     def test_add_details(self) -> None:
         """Test add_details method for adding collapsible sections."""
         action = GitHubAction()
@@ -1349,7 +1437,7 @@ class TestSummary:
         result = summary.add_details("Summary Text", "Collapsible content")
 
         # Verify HTML was added
-        html = summary._buffer
+        html = summary.stringify()
         assert "<details>" in html
         assert "<summary>Summary Text</summary>" in html
         assert "Collapsible content" in html
@@ -1367,7 +1455,7 @@ class TestSummary:
         result = summary.add_image("path/to/image.png", "Alt text")
 
         # Verify HTML was added
-        html = summary._buffer
+        html = summary.stringify()
         assert '<img src="path/to/image.png" alt="Alt text">' in html
 
         # Clear buffer
@@ -1377,7 +1465,7 @@ class TestSummary:
         summary.add_image("path/to/image.png", "Alt text", {"width": "100px", "height": "80px"})
 
         # Verify HTML with additional attributes was added
-        html = summary._buffer
+        html = summary.stringify()
         assert '<img src="path/to/image.png" alt="Alt text" width="100px" height="80px">' in html
 
         # Verify method returns summary instance for chaining
@@ -1392,7 +1480,7 @@ class TestSummary:
         result = summary.add_heading("Heading 1")
 
         # Verify HTML was added
-        assert "<h1>Heading 1</h1>" in summary._buffer
+        assert "<h1>Heading 1</h1>" in summary.stringify()
 
         # Clear buffer
         summary.empty_buffer()
@@ -1402,14 +1490,20 @@ class TestSummary:
             summary.add_heading(f"Heading {level}", level)
 
         # Verify all headings were added
-        html = summary._buffer
+        html = summary.stringify()
         for level in range(1, 7):
             assert f"<h{level}>Heading {level}</h{level}>" in html
 
         # Test invalid level (should default to h1)
         summary.empty_buffer()
         summary.add_heading("Invalid Level", 8)
-        assert "<h1>Invalid Level</h1>" in summary._buffer
+        assert "<h1>Invalid Level</h1>" in summary.stringify()
+
+        # String levels are accepted, anything else defaults to h1
+        summary.empty_buffer()
+        summary.add_heading("String Level", "3")
+        summary.add_heading("No Level", None)
+        assert summary.stringify() == f"<h3>String Level</h3>{os.linesep}<h1>No Level</h1>{os.linesep}"
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1423,7 +1517,7 @@ class TestSummary:
         result = summary.add_separator()
 
         # Verify HTML was added
-        assert "<hr>" in summary._buffer
+        assert summary.stringify() == "<hr>" + os.linesep
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1437,7 +1531,7 @@ class TestSummary:
         result = summary.add_break()
 
         # Verify HTML was added
-        assert "<br>" in summary._buffer
+        assert summary.stringify() == "<br>" + os.linesep
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1451,7 +1545,7 @@ class TestSummary:
         result = summary.add_quote("This is a quote")
 
         # Verify HTML was added
-        assert "<blockquote>This is a quote</blockquote>" in summary._buffer
+        assert "<blockquote>This is a quote</blockquote>" in summary.stringify()
 
         # Clear buffer
         summary.empty_buffer()
@@ -1460,7 +1554,7 @@ class TestSummary:
         summary.add_quote("Cited quote", "https://example.com")
 
         # Verify HTML with citation was added
-        assert '<blockquote cite="https://example.com">Cited quote</blockquote>' in summary._buffer
+        assert '<blockquote cite="https://example.com">Cited quote</blockquote>' in summary.stringify()
 
         # Verify method returns summary instance for chaining
         assert result is summary
@@ -1474,7 +1568,7 @@ class TestSummary:
         result = summary.add_link("Link Text", "https://example.com")
 
         # Verify HTML was added
-        assert '<a href="https://example.com">Link Text</a>' in summary._buffer
+        assert '<a href="https://example.com">Link Text</a>' in summary.stringify()
 
         # Verify method returns summary instance for chaining
         assert result is summary
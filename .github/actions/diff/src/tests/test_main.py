@@ -3,9 +3,11 @@
 from typing import Dict, List, Any, Optional, TYPE_CHECKING
 import json
 import os
+from pathlib import Path
 
 import pytest
 
+from github_actions import GitHubAction
 from main import create_summary_lists, get_event_type, main, set_action_outputs
 from utils import FilesByStatus
 
@@ -69,7 +71,45 @@ def test_set_action_outputs(mocker: "MockerFixture", mock_files_by_status: Files
     mock_action.set_output.assert_any_call("any-changed", "true")
 
     # Verify the changed-files output is set with the expected JSON
-    mock_action.set_output.assert_any_call("changed-files", json.dumps(expected_output))
+    mock_action.set_output.assert_any_call("changed-files", json.dumps(expected_output, separators=(",", ":")))
+
+    # Verify the outputs are written before the function returns
+    mock_action.flush_file_commands.assert_called_once()
+
+
+def test_set_action_outputs_write_error(
+    monkeypatch: "MonkeyPatch", mock_files_by_status: FilesByStatus, tmp_path: Path
+) -> None:
+    """
+    Test that failing to write the outputs raises instead of being deferred to exit.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+        mock_files_by_status: Mock FilesByStatus fixture
+        tmp_path: Temporary path fixture
+    """
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "missing" / "output"))
+
+    with pytest.raises(FileNotFoundError, match="Missing file at path"):
+        set_action_outputs(GitHubAction(), mock_files_by_status)
+
+
+def test_set_action_outputs_unicode_filenames(mocker: "MockerFixture") -> None:
+    """
+    Test that non-ASCII filenames are not escaped in the changed-files output.
+
+    Args:
+        mocker: Pytest mocker fixture
+    """
+    mock_action = mocker.Mock()
+
+    files: FilesByStatus = {"added": ["docs/résumé.md"], "modified": [], "removed": [], "renamed": []}
+
+    set_action_outputs(mock_action, files)
+
+    mock_action.set_output.assert_any_call(
+        "changed-files", '{"added":["docs/résumé.md"],"modified":[],"deleted":[]}'
+    )
 
 
 def test_set_action_outputs_no_changes(mocker: "MockerFixture") -> None:
@@ -108,21 +148,61 @@ def test_create_summary_lists(mocker: "MockerFixture", mock_files_by_status: Fil
     # Call the function
     create_summary_lists(mock_action, mock_files_by_status)
 
-    # Verify summary methods were called
-    mock_summary.add_heading.assert_any_call("Changed Files Summary", 2)
-    mock_summary.add_heading.assert_any_call("Added Files", 3)
-    mock_summary.add_heading.assert_any_call("Modified Files", 3)
-    mock_summary.add_heading.assert_any_call("Deleted Files", 3)
-
-    # Verify lists were added
-    mock_summary.add_list.assert_any_call(["file1.txt", "file2.py"])
-    mock_summary.add_list.assert_any_call(["file3.md", "file4.yaml"])
-    mock_summary.add_list.assert_any_call(["file5.json"])
+    # Verify the headings and lists were added as a single chunk
+    expected_lines = [
+        "<h2>Changed Files Summary</h2>",
+        "<h3>Added Files</h3>",
+        "<ul><li>file1.txt</li><li>file2.py</li></ul>",
+        "<h3>Modified Files</h3>",
+        "<ul><li>file3.md</li><li>file4.yaml</li></ul>",
+        "<h3>Deleted Files</h3>",
+        "<ul><li>file5.json</li></ul>",
+    ]
+    mock_summary.add_raw.assert_called_once_with(os.linesep.join(expected_lines), True)
 
     # Verify write was called
     mock_summary.write.assert_called_once()
 
 
+def test_create_summary_lists_matches_summary_builders(
+    mocker: "MockerFixture", mock_files_by_status: FilesByStatus
+) -> None:
+    """
+    Test the assembled summary matches what the Summary heading and list builders produce.
+
+    Args:
+        mocker: Pytest mocker fixture
+        mock_files_by_status: Mock FilesByStatus fixture
+    """
+    action = GitHubAction()
+    mocker.patch.object(action.summary, "write")
+
+    create_summary_lists(action, mock_files_by_status)
+
+    expected = GitHubAction().summary.add_heading("Changed Files Summary", 2)
+    for title, category in [("Added Files", "added"), ("Modified Files", "modified"), ("Deleted Files", "removed")]:
+        expected.add_heading(title, 3).add_list(mock_files_by_status[category])
+
+    assert action.summary.stringify() == expected.stringify()
+
+
+def test_create_summary_lists_escapes_file_names(mocker: "MockerFixture") -> None:
+    """
+    Test that markup characters in file names are escaped in the summary lists.
+
+    Args:
+        mocker: Pytest mocker fixture
+    """
+    mock_action = mocker.Mock()
+
+    files: FilesByStatus = {"added": ["docs/<draft>&notes.md"], "modified": [], "removed": [], "renamed": []}
+
+    create_summary_lists(mock_action, files)
+
+    text, _ = mock_action.summary.add_raw.call_args.args
+    assert "<li>docs/&lt;draft&gt;&amp;notes.md</li>" in text
+
+
 def test_create_summary_lists_exception(
     mocker: "MockerFixture", mock_files_by_status: FilesByStatus, capsys: "CaptureFixture[str]"
 ) -> None:
@@ -239,6 +319,25 @@ def test_main_push_event(mocker: "MockerFixture", push_event: Dict[str, Any]) ->
     mock_set_outputs.assert_called_once_with(mock_action, mock_files)
 
 
+def test_main_push_event_skips_rename_detection(mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
+    """
+    Test that push events are diffed without rename detection.
+
+    Args:
+        mocker: Pytest mocker fixture
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setenv("GITHUB_EVENT_NAME", "push")
+    mock_action = mocker.patch("main.GitHubAction").return_value
+    mock_action.get_input.return_value = ""
+    mock_action.get_multiline_input.return_value = ["**/*.py"]
+    mock_get_files = mocker.patch("main.get_push_changed_files", return_value=None)
+
+    main()
+
+    mock_get_files.assert_called_once_with(base_sha="", head_sha="", patterns=["**/*.py"], detect_renames=False)
+
+
 def test_main_unsupported_event(mocker: "MockerFixture") -> None:
     """
     Test main function with unsupported event type.
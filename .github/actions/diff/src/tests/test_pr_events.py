@@ -3,17 +3,18 @@
 from typing import Dict, List, Any, Optional, TYPE_CHECKING
 import json
 import os
+import sys
 from pathlib import Path
 
 import pytest
 
 from pr_events import (
-    categorize_files,
+    categorize_and_filter_files,
     get_changed_files,
     get_pr_changed_files,
     get_pr_number_from_event,
 )
-from utils import FilesByStatus
+from utils import FilesByStatus, filter_files_by_patterns
 
 if TYPE_CHECKING:
     from _pytest.capture import CaptureFixture
@@ -66,23 +67,62 @@ def test_get_pr_number_from_event_no_pr(temp_github_env: Dict[str, str], tmp_pat
     assert pr_number is None
 
 
-def test_categorize_files(mock_pr_files: List[Dict[str, Any]]) -> None:
+def test_categorize_and_filter_files(mock_pr_files: List[Dict[str, Any]]) -> None:
     """
-    Test categorizing files by status from PR data.
+    Test categorizing and filtering PR files in a single pass.
 
     Args:
         mock_pr_files: Sample PR files fixture
     """
-    categorized = categorize_files(mock_pr_files)
+    result = categorize_and_filter_files(mock_pr_files, ["**/*.txt", "**/*.md"])
 
-    assert categorized["added"] == ["file1.txt", "file2.py"]
-    assert categorized["modified"] == ["file3.md", "file4.yaml"]
-    assert categorized["removed"] == ["file5.json"]
+    # Renames count as removing the old path and adding the new one
+    assert result["added"] == ["file1.txt", "new_name.txt"]
+    assert result["modified"] == ["file3.md"]
+    assert result["removed"] == ["old_name.txt"]
+    assert result["renamed"] == [{"old": "old_name.txt", "new": "new_name.txt"}]
 
-    # Check renamed files
-    assert len(categorized["renamed"]) == 2
-    assert {"old": "old_name.txt", "new": "new_name.txt"} in categorized["renamed"]
-    assert {"old": "old_script.py", "new": "new_script.py"} in categorized["renamed"]
+
+def test_categorize_and_filter_files_no_patterns(mock_pr_files: List[Dict[str, Any]]) -> None:
+    """
+    Test that all files are kept when no patterns are given.
+
+    Args:
+        mock_pr_files: Sample PR files fixture
+    """
+    result = categorize_and_filter_files(mock_pr_files)
+
+    assert result["added"] == ["file1.txt", "file2.py", "new_name.txt", "new_script.py"]
+    assert result["modified"] == ["file3.md", "file4.yaml"]
+    assert result["removed"] == ["file5.json", "old_name.txt", "old_script.py"]
+    assert len(result["renamed"]) == 2
+
+
+def test_categorize_and_filter_files_matches_push_filtering(mock_pr_files: List[Dict[str, Any]]) -> None:
+    """
+    Test that PR files are reported exactly like the same changes on the push path.
+
+    Args:
+        mock_pr_files: Sample PR files fixture
+    """
+    # A rename onto a path that is also listed as added is only reported once
+    files = [*mock_pr_files, {"filename": "moved.txt", "status": "added", "previous_filename": None}]
+    files.append({"filename": "moved.txt", "status": "renamed", "previous_filename": "file5.json"})
+    push_files: FilesByStatus = {
+        "added": ["file1.txt", "file2.py", "moved.txt"],
+        "modified": ["file3.md", "file4.yaml"],
+        "removed": ["file5.json"],
+        "renamed": [
+            {"old": "old_name.txt", "new": "new_name.txt"},
+            {"old": "old_script.py", "new": "new_script.py"},
+            {"old": "file5.json", "new": "moved.txt"},
+        ],
+    }
+
+    for patterns in ([], ["**/*.txt"], ["**/*.json", "**/*.py"]):
+        result = categorize_and_filter_files(files, patterns)
+        assert result == filter_files_by_patterns(push_files, patterns)
+    assert categorize_and_filter_files(files)["added"].count("moved.txt") == 1
 
 
 def test_get_changed_files(mocker: "MockerFixture", mock_pr_files: List[Dict[str, Any]]) -> None:
@@ -93,10 +133,11 @@ def test_get_changed_files(mocker: "MockerFixture", mock_pr_files: List[Dict[str
         mocker: Pytest mock fixture
         mock_pr_files: Sample PR files data
     """
-    # Mock subprocess.run to return PR files data
-    mock_subprocess = mocker.patch("subprocess.run")
-    mock_subprocess.return_value.stdout = json.dumps(mock_pr_files)
-    mock_subprocess.return_value.returncode = 0
+    # Mock subprocess.Popen to stream one JSON object per line, as gh does with --jq
+    mock_popen = mocker.patch("subprocess.Popen")
+    mock_process = mock_popen.return_value
+    mock_process.stdout = [json.dumps(file) + "\n" for file in mock_pr_files]
+    mock_process.returncode = 0
 
     # Mock environment variable
     mocker.patch.dict(os.environ, {"GITHUB_REPOSITORY": "user/repo"})
@@ -104,15 +145,90 @@ def test_get_changed_files(mocker: "MockerFixture", mock_pr_files: List[Dict[str
     result = get_changed_files(pr_number=123, token="fake-token")
 
     # Verify the subprocess call
-    mock_subprocess.assert_called_once()
-    assert mock_subprocess.call_args[0][0] == ["gh", "api", "repos/user/repo/pulls/123/files", "--paginate"]
+    mock_popen.assert_called_once()
+    assert mock_popen.call_args[0][0] == [
+        "gh",
+        "api",
+        "repos/user/repo/pulls/123/files?per_page=100",
+        "--paginate",
+        "--jq",
+        ".[] | {filename, status, previous_filename}",
+    ]
     # Check environment variables passed to subprocess
-    assert mock_subprocess.call_args[1]["env"]["GH_TOKEN"] == "fake-token"
+    assert mock_popen.call_args[1]["env"]["GH_TOKEN"] == "fake-token"
 
     # Verify result
     assert result == mock_pr_files
 
 
+def test_get_changed_files_inherits_env(mocker: "MockerFixture") -> None:
+    """
+    Test that the environment is inherited when the token is already set.
+
+    Args:
+        mocker: Pytest mock fixture
+    """
+    mock_popen = mocker.patch("subprocess.Popen")
+    mock_process = mock_popen.return_value
+    mock_process.stdout = []
+    mock_process.returncode = 0
+
+    mocker.patch.dict(os.environ, {"GITHUB_REPOSITORY": "user/repo", "GH_TOKEN": "fake-token"})
+
+    get_changed_files(pr_number=123, token="fake-token")
+
+    assert mock_popen.call_args[1]["env"] is None
+
+
+def test_get_changed_files_large_stderr(monkeypatch: "MonkeyPatch", tmp_path: Path) -> None:
+    """
+    Test that a gh process writing more stderr than a pipe holds does not block the read.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+        tmp_path: Temporary path fixture
+    """
+    fake_gh = tmp_path / "gh"
+    fake_gh.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "sys.stderr.write('warning ' * 200_000)\n"
+        'print(\'{"filename": "a.txt", "status": "added", "previous_filename": null}\')\n'
+    )
+    fake_gh.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    result = get_changed_files(pr_number=123)
+
+    assert result == [{"filename": "a.txt", "status": "added", "previous_filename": None}]
+
+
+def test_get_changed_files_cli_error(mocker: "MockerFixture") -> None:
+    """
+    Test that a failing GitHub CLI command raises CalledProcessError.
+
+    Args:
+        mocker: Pytest mock fixture
+    """
+    import subprocess
+
+    def fake_popen(cmd: List[str], **kwargs: Any) -> Any:
+        # gh reports the failure on stderr, which is redirected to a file
+        kwargs["stderr"].write("HTTP 404: Not Found")
+        return mock_process
+
+    mock_process = mocker.MagicMock()
+    mock_process.__enter__.return_value = mock_process
+    mock_process.stdout = []
+    mock_process.returncode = 1
+    mocker.patch("subprocess.Popen", side_effect=fake_popen)
+
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        get_changed_files(pr_number=123, token="fake-token")
+
+    assert exc_info.value.stderr == "HTTP 404: Not Found"
+
+
 def test_get_pr_changed_files_success(
     mocker: "MockerFixture",
     mock_pr_files: List[Dict[str, Any]],
@@ -1,7 +1,6 @@
 """Tests for push events in the GitHub Action."""
 
 from typing import Dict, List, Any, Tuple, TYPE_CHECKING
-import os
 import subprocess
 from unittest.mock import call
 
@@ -31,14 +30,15 @@ class TestGetChangedFilesFromGit:
             mocker: Pytest mocker fixture
         """
         # Sample git diff output
-        git_diff_output = """A\tfile1.txt
-M\tfile2.py
-M\tpath/to/file3.md
-D\tfile4.json
-R100\told_name.txt\tnew_name.txt
-R095\told_script.py\tnew_script.py
-A\t.github/workflow.yml
-"""
+        git_diff_output = (
+            b"A\0file1.txt\0"
+            b"M\0file2.py\0"
+            b"M\0path/to/file3.md\0"
+            b"D\0file4.json\0"
+            b"R100\0old_name.txt\0new_name.txt\0"
+            b"R095\0old_script.py\0new_script.py\0"
+            b"A\0.github/workflow.yml\0"
+        )
         # Mock subprocess.run to return the sample output
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.stdout = git_diff_output
@@ -49,13 +49,16 @@ A\t.github/workflow.yml
 
         # Verify correct git command was called
         mock_run.assert_called_once()
-        assert mock_run.call_args[0][0] == ["git", "diff", "--name-status", "base-sha...head-sha"]
+        assert mock_run.call_args[0][0] == ["git", "diff", "-z", "--name-status", "base-sha...head-sha"]
 
         # Verify the result contains correctly categorized files
-        assert result["A"] == ["file1.txt", ".github/workflow.yml"]
-        assert result["M"] == ["file2.py", "path/to/file3.md"]
-        assert result["D"] == ["file4.json"]
-        assert result["R"] == ["old_name.txt\tnew_name.txt", "old_script.py\tnew_script.py"]
+        assert result["added"] == ["file1.txt", ".github/workflow.yml"]
+        assert result["modified"] == ["file2.py", "path/to/file3.md"]
+        assert result["removed"] == ["file4.json"]
+        assert result["renamed"] == [
+            {"old": "old_name.txt", "new": "new_name.txt"},
+            {"old": "old_script.py", "new": "new_script.py"},
+        ]
 
     def test_empty_output(self, mocker: "MockerFixture") -> None:
         """
@@ -66,17 +69,89 @@ A\t.github/workflow.yml
         """
         # Mock subprocess to return empty output
         mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value.stdout = ""
+        mock_run.return_value.stdout = b""
         mock_run.return_value.returncode = 0
 
         # Call the function under test
         result = get_changed_files_from_git("base-sha", "head-sha")
 
         # Verify all categories exist but are empty
-        assert result["A"] == []
-        assert result["M"] == []
-        assert result["D"] == []
-        assert result["R"] == []
+        assert result["added"] == []
+        assert result["modified"] == []
+        assert result["removed"] == []
+        assert result["renamed"] == []
+
+    def test_special_characters_in_paths(self, mocker: "MockerFixture") -> None:
+        """
+        Test that paths containing tabs and newlines are parsed verbatim.
+
+        Args:
+            mocker: Pytest mocker fixture
+        """
+        mock_run = mocker.patch("subprocess.run")
+        mock_run.return_value.stdout = b"A\0tab\tname.txt\0R100\0old\nname.txt\0new name.txt\0"
+        mock_run.return_value.returncode = 0
+
+        result = get_changed_files_from_git("base-sha", "head-sha")
+
+        assert result["added"] == ["tab\tname.txt"]
+        assert result["renamed"] == [{"old": "old\nname.txt", "new": "new name.txt"}]
+
+    def test_carriage_return_in_path(self, mocker: "MockerFixture") -> None:
+        """
+        Test that a carriage return in a path is not translated as a newline.
+
+        Args:
+            mocker: Pytest mocker fixture
+        """
+        mock_run = mocker.patch("subprocess.run")
+        mock_run.return_value.stdout = b"A\0carriage\rreturn.txt\0M\0crlf\r\nname.txt\0"
+        mock_run.return_value.returncode = 0
+
+        result = get_changed_files_from_git("base-sha", "head-sha")
+
+        assert "text" not in mock_run.call_args[1]
+        assert result["added"] == ["carriage\rreturn.txt"]
+        assert result["modified"] == ["crlf\r\nname.txt"]
+
+    def test_without_rename_detection(self, mocker: "MockerFixture") -> None:
+        """
+        Test that rename detection can be turned off.
+
+        Args:
+            mocker: Pytest mocker fixture
+        """
+        mock_run = mocker.patch("subprocess.run")
+        mock_run.return_value.stdout = b"D\0old_name.txt\0A\0new_name.txt\0"
+        mock_run.return_value.returncode = 0
+
+        result = get_changed_files_from_git("base-sha", "head-sha", detect_renames=False)
+
+        assert mock_run.call_args[0][0] == [
+            "git",
+            "diff",
+            "-z",
+            "--name-status",
+            "--no-renames",
+            "base-sha...head-sha",
+        ]
+        assert result["added"] == ["new_name.txt"]
+        assert result["removed"] == ["old_name.txt"]
+        assert result["renamed"] == []
+
+    def test_same_commit(self, mocker: "MockerFixture") -> None:
+        """
+        Test that comparing a commit with itself returns no changes without running git.
+
+        Args:
+            mocker: Pytest mocker fixture
+        """
+        mock_run = mocker.patch("subprocess.run")
+
+        result = get_changed_files_from_git("same-sha", "same-sha")
+
+        mock_run.assert_not_called()
+        assert result == {"added": [], "modified": [], "removed": [], "renamed": []}
 
     def test_custom_repo_path(self, mocker: "MockerFixture") -> None:
         """
@@ -87,7 +162,7 @@ A\t.github/workflow.yml
         """
         # Mock subprocess
         mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value.stdout = "A\tfile.txt"
+        mock_run.return_value.stdout = b"A\0file.txt\0"
         mock_run.return_value.returncode = 0
 
         # Call with custom repo path
@@ -104,29 +179,33 @@ A\t.github/workflow.yml
         Args:
             mocker: Pytest mocker fixture
         """
-        # Mock subprocess to raise an error
-        error = subprocess.CalledProcessError(128, "git diff")
-        error.stdout = ""
-        error.stderr = "fatal: Not a git repository"
-        mock_run = mocker.patch("subprocess.run", side_effect=error)
+        # Mock subprocess to report a failure
+        mock_run = mocker.patch("subprocess.run")
+        mock_run.return_value.stdout = b""
+        mock_run.return_value.stderr = b"fatal: Not a git repository"
+        mock_run.return_value.returncode = 128
 
-        # The function should propagate the exception
-        with pytest.raises(subprocess.CalledProcessError):
+        # The function should raise with git's message decoded
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
             get_changed_files_from_git("base-sha", "head-sha")
 
+        assert exc_info.value.returncode == 128
+        assert exc_info.value.stderr == "fatal: Not a git repository"
+
 
 class TestParseGitShasFromEnv:
     """Tests for parse_git_shas_from_env function."""
 
-    def test_normal_environment(self, mocker: "MockerFixture") -> None:
+    def test_normal_environment(self, monkeypatch: "MonkeyPatch") -> None:
         """
         Test parsing SHAs from normal environment variables.
 
         Args:
-            mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
         # Mock environment variables
-        mocker.patch.dict(os.environ, {"GITHUB_BEFORE": "base-sha-12345", "GITHUB_AFTER": "head-sha-67890"})
+        monkeypatch.setenv("GITHUB_BEFORE", "base-sha-12345")
+        monkeypatch.setenv("GITHUB_AFTER", "head-sha-67890")
 
         # Call the function under test
         base_sha, head_sha = parse_git_shas_from_env()
@@ -135,17 +214,17 @@ class TestParseGitShasFromEnv:
         assert base_sha == "base-sha-12345"
         assert head_sha == "head-sha-67890"
 
-    def test_new_branch(self, mocker: "MockerFixture") -> None:
+    def test_new_branch(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
         """
         Test parsing SHAs for a new branch (GITHUB_BEFORE is all zeros).
 
         Args:
             mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
         # Mock environment variables for new branch scenario
-        mocker.patch.dict(
-            os.environ, {"GITHUB_BEFORE": "0000000000000000000000000000000000000000", "GITHUB_AFTER": "head-sha-67890"}
-        )
+        monkeypatch.setenv("GITHUB_BEFORE", "0000000000000000000000000000000000000000")
+        monkeypatch.setenv("GITHUB_AFTER", "head-sha-67890")
 
         # Mock git rev-parse command for HEAD~1
         mock_run = mocker.patch("subprocess.run")
@@ -156,22 +235,24 @@ class TestParseGitShasFromEnv:
         base_sha, head_sha = parse_git_shas_from_env()
 
         # Verify the correct commands were run and SHAs returned
-        mock_run.assert_called_once_with(["git", "rev-parse", "HEAD~1"], capture_output=True, text=True, check=True)
+        mock_run.assert_called_once_with(
+            ["git", "rev-parse", "HEAD~1"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True
+        )
 
         assert base_sha == "previous-sha-12345"
         assert head_sha == "head-sha-67890"
 
-    def test_first_commit(self, mocker: "MockerFixture") -> None:
+    def test_first_commit(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
         """
         Test parsing SHAs for the first commit in a repository.
 
         Args:
             mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
         # Mock environment variables with zeros for GITHUB_BEFORE
-        mocker.patch.dict(
-            os.environ, {"GITHUB_BEFORE": "0000000000000000000000000000000000000000", "GITHUB_AFTER": "head-sha-67890"}
-        )
+        monkeypatch.setenv("GITHUB_BEFORE", "0000000000000000000000000000000000000000")
+        monkeypatch.setenv("GITHUB_AFTER", "head-sha-67890")
 
         # Mock git rev-parse to fail (simulating first commit)
         mock_run = mocker.patch("subprocess.run")
@@ -186,15 +267,17 @@ class TestParseGitShasFromEnv:
         assert base_sha == "4b825dc642cb6eb9a060e54bf8d69288fbee4904"  # Git empty tree
         assert head_sha == "head-sha-67890"
 
-    def test_missing_after_sha(self, mocker: "MockerFixture") -> None:
+    def test_missing_after_sha(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
         """
         Test parsing SHAs when GITHUB_AFTER is missing.
 
         Args:
             mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
         # Mock environment with only GITHUB_BEFORE
-        mocker.patch.dict(os.environ, {"GITHUB_BEFORE": "base-sha-12345"}, clear=True)
+        monkeypatch.delenv("GITHUB_AFTER", raising=False)
+        monkeypatch.setenv("GITHUB_BEFORE", "base-sha-12345")
 
         # Mock git rev-parse for HEAD
         mock_run = mocker.patch("subprocess.run")
@@ -205,20 +288,47 @@ class TestParseGitShasFromEnv:
         base_sha, head_sha = parse_git_shas_from_env()
 
         # Verify correct command was run to get current HEAD
-        mock_run.assert_called_once_with(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+        mock_run.assert_called_once_with(
+            ["git", "rev-parse", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True
+        )
 
         assert base_sha == "base-sha-12345"
         assert head_sha == "current-head-sha"
 
-    def test_missing_both_shas(self, mocker: "MockerFixture") -> None:
+    def test_missing_both_shas_single_rev_parse(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
+        """
+        Test that both SHAs are resolved with one git command when neither is set.
+
+        Args:
+            mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
+        """
+        monkeypatch.delenv("GITHUB_BEFORE", raising=False)
+        monkeypatch.delenv("GITHUB_AFTER", raising=False)
+
+        mock_run = mocker.patch("subprocess.run")
+        mock_run.return_value.stdout = "current-head-sha\nprevious-head-sha\n"
+        mock_run.return_value.returncode = 0
+
+        base_sha, head_sha = parse_git_shas_from_env()
+
+        mock_run.assert_called_once_with(
+            ["git", "rev-parse", "HEAD", "HEAD~1"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True
+        )
+        assert base_sha == "previous-head-sha"
+        assert head_sha == "current-head-sha"
+
+    def test_missing_both_shas(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
         """
         Test parsing SHAs when both environment variables are missing.
 
         Args:
             mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
         # Clear environment variables
-        mocker.patch.dict(os.environ, {}, clear=True)
+        monkeypatch.delenv("GITHUB_BEFORE", raising=False)
+        monkeypatch.delenv("GITHUB_AFTER", raising=False)
 
         # Mock git rev-parse calls for both SHAs
         mock_run = mocker.patch("subprocess.run")
@@ -238,15 +348,17 @@ class TestParseGitShasFromEnv:
             # This should fail since we're missing GITHUB_BEFORE
             parse_git_shas_from_env()
 
-    def test_rev_parse_failure(self, mocker: "MockerFixture") -> None:
+    def test_rev_parse_failure(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
         """
         Test handling git command failures when determining HEAD.
 
         Args:
             mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
         # Mock environment with only GITHUB_BEFORE
-        mocker.patch.dict(os.environ, {"GITHUB_BEFORE": "base-sha-12345"}, clear=True)
+        monkeypatch.delenv("GITHUB_AFTER", raising=False)
+        monkeypatch.setenv("GITHUB_BEFORE", "base-sha-12345")
 
         # Mock git rev-parse to fail for HEAD
         mock_run = mocker.patch("subprocess.run")
@@ -274,13 +386,14 @@ class TestGetPushChangedFiles:
         mocker.patch("src.push_events.parse_git_shas_from_env", return_value=("base-sha", "head-sha"))
 
         # Sample git diff output with various file types
-        git_diff_output = """A\tfile1.txt
-A\tfile2.py
-M\tfile3.yaml
-M\tfile4.md
-D\tfile5.json
-R100\told_file.txt\tnew_file.txt
-"""
+        git_diff_output = (
+            b"A\0file1.txt\0"
+            b"A\0file2.py\0"
+            b"M\0file3.yaml\0"
+            b"M\0file4.md\0"
+            b"D\0file5.json\0"
+            b"R100\0old_file.txt\0new_file.txt\0"
+        )
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.stdout = git_diff_output
         mock_run.return_value.returncode = 0
@@ -313,18 +426,47 @@ R100\told_file.txt\tnew_file.txt
         """
         # Mock git diff
         mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value.stdout = "A\tfile.txt"
+        mock_run.return_value.stdout = b"A\0file.txt\0"
         mock_run.return_value.returncode = 0
 
         # Call with explicit SHAs
         get_push_changed_files(base_sha="explicit-base", head_sha="explicit-head")
 
         # Verify git command used explicit SHAs
-        assert mock_run.call_args[0][0] == ["git", "diff", "--name-status", "explicit-base...explicit-head"]
+        assert mock_run.call_args[0][0] == ["git", "diff", "-z", "--name-status", "explicit-base...explicit-head"]
 
         # Verify parse_git_shas_from_env wasn't called
         assert not mocker.patch.object("src.push_events", "parse_git_shas_from_env", return_value=None).called
 
+    def test_only_missing_sha_resolved(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
+        """
+        Test that only the SHA that was not supplied is resolved with git.
+
+        Args:
+            mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
+        """
+        monkeypatch.delenv("GITHUB_BEFORE", raising=False)
+        monkeypatch.delenv("GITHUB_AFTER", raising=False)
+
+        mock_run = mocker.patch("subprocess.run")
+        mock_run.side_effect = [
+            mocker.Mock(stdout="current-head-sha\n", returncode=0),
+            mocker.Mock(stdout=b"A\0file.txt\0", returncode=0),
+        ]
+
+        get_push_changed_files(base_sha="explicit-base")
+
+        assert mock_run.call_count == 2
+        assert mock_run.call_args_list[0][0][0] == ["git", "rev-parse", "HEAD"]
+        assert mock_run.call_args_list[1][0][0] == [
+            "git",
+            "diff",
+            "-z",
+            "--name-status",
+            "explicit-base...current-head-sha",
+        ]
+
     def test_git_command_error(self, mocker: "MockerFixture", capsys: "CaptureFixture[str]") -> None:
         """
         Test handling git command errors.
@@ -400,18 +542,21 @@ R100\told_file.txt\tnew_file.txt
         # Verify function returned None
         assert result is None
 
-    def test_custom_repo_path(self, mocker: "MockerFixture") -> None:
+    def test_custom_repo_path(self, mocker: "MockerFixture", monkeypatch: "MonkeyPatch") -> None:
         """
         Test using a custom repository path.
 
         Args:
             mocker: Pytest mocker fixture
+            monkeypatch: Pytest monkeypatch fixture
         """
         # Mock SHA parsing and git diff
         mocker.patch("src.push_events.parse_git_shas_from_env", return_value=("base-sha", "head-sha"))
+        monkeypatch.setenv("GITHUB_BEFORE", "base-sha")
+        monkeypatch.setenv("GITHUB_AFTER", "head-sha")
 
         mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value.stdout = "A\tfile.txt"
+        mock_run.return_value.stdout = b"A\0file.txt\0"
         mock_run.return_value.returncode = 0
 
         # Call with custom repo path
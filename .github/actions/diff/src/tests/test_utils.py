@@ -1,10 +1,17 @@
 """Tests for utility functions in the GitHub Action."""
 
+from pathlib import PurePosixPath
 from typing import List, TYPE_CHECKING
 
 import pytest
 
-from utils import FilesByStatus, filter_files_by_patterns, filter_paths_with_patterns
+import utils
+from utils import (
+    FilesByStatus,
+    compile_patterns,
+    filter_files_by_patterns,
+    filter_paths_with_patterns,
+)
 
 if TYPE_CHECKING:
     from pytest_mock.plugin import MockerFixture
@@ -70,6 +77,47 @@ def test_filter_paths_with_patterns_multiple_patterns() -> None:
     assert result == ["file2.py", "dir/file3.md"]
 
 
+@pytest.mark.parametrize(
+    "pattern",
+    ["**/*", "**", "**/*.py", "*.py", "dir/**", "dir/*", "dir/file3.md", "**/dir/**", "src/**/*.py", "file?.txt", "[a-f]*"],
+)
+def test_compile_pattern_matches_full_match(pattern: str) -> None:
+    """
+    Test compiled patterns agree with PurePath.full_match.
+
+    Args:
+        pattern: Glob pattern under test
+    """
+    file_paths = ["dir", "dir/file3.md", "dir/sub/file.py", "a/dir/x", "file1.txt", "file2.py", ".py", "src/a/b.py", "dirx/a"]
+
+    matcher = compile_patterns([pattern])
+
+    for path in file_paths:
+        assert matcher(path) == PurePosixPath(path).full_match(pattern), path
+
+
+def test_compile_patterns_combines_patterns() -> None:
+    """
+    Test a combined matcher accepts a path matching any of the patterns.
+    """
+    patterns = ["README.md", "**/*.py", "docs/**", "src/*/[ab].txt"]
+    file_paths = ["README.md", "a/b.py", "docs/guide/index.md", "src/x/a.txt", "src/x/c.txt", "docs", "notes.md"]
+
+    matches = compile_patterns(patterns)
+
+    assert [path for path in file_paths if matches(path)] == ["README.md", "a/b.py", "docs/guide/index.md", "src/x/a.txt"]
+    for path in file_paths:
+        assert matches(path) == any(PurePosixPath(path).full_match(pattern) for pattern in patterns), path
+
+
+def test_compile_patterns_cached() -> None:
+    """
+    Test that compiling the same pattern list twice reuses the matcher.
+    """
+    assert compile_patterns(["**/*.py", "docs/**"]) is compile_patterns(["**/*.py", "docs/**"])
+    assert compile_patterns(["**/*.py"]) is not compile_patterns(["**/*.md"])
+
+
 def test_filter_files_by_patterns(mock_files_by_status: FilesByStatus) -> None:
     """
     Test filtering FilesByStatus object by patterns.
@@ -81,18 +129,90 @@ def test_filter_files_by_patterns(mock_files_by_status: FilesByStatus) -> None:
 
     result = filter_files_by_patterns(mock_files_by_status, patterns)
 
-    # Check that only .txt and .py files were retained
-    assert result["added"] == ["file1.txt", "file2.py"]
+    # Check that only .txt and .py files were retained, with renames merged in as removed + added
+    assert result["added"] == ["file1.txt", "file2.py", "new_name.txt", "new_script.py"]
     assert result["modified"] == []  # No .txt or .py files in modified
-    assert result["removed"] == []  # No .txt or .py files in removed
+    assert result["removed"] == ["old_name.txt", "old_script.py"]
+
+    # Check renamed files - both renames match on either side
+    assert result["renamed"] == [
+        {"old": "old_name.txt", "new": "new_name.txt"},
+        {"old": "old_script.py", "new": "new_script.py"},
+    ]
+
+
+def test_filter_files_by_patterns_renamed_either_side() -> None:
+    """
+    Test that a rename is kept when either its old or its new path matches.
+    """
+    files: FilesByStatus = {
+        "added": [],
+        "modified": [],
+        "removed": [],
+        "renamed": [
+            {"old": "docs/a.md", "new": "src/a.py"},
+            {"old": "src/b.py", "new": "docs/b.md"},
+            {"old": "docs/c.md", "new": "docs/d.md"},
+        ],
+    }
+
+    result = filter_files_by_patterns(files, ["**/*.py"])
+
+    assert result["added"] == ["src/a.py"]
+    assert result["removed"] == ["src/b.py"]
+    assert result["renamed"] == files["renamed"][:2]
+
+
+def test_filter_files_by_patterns_does_not_modify_input() -> None:
+    """
+    Test that merging renames into the result leaves the input lists untouched.
+    """
+    files: FilesByStatus = {
+        "added": ["a.txt"],
+        "modified": [],
+        "removed": ["b.txt"],
+        "renamed": [{"old": "old.txt", "new": "new.txt"}],
+    }
+
+    result = filter_files_by_patterns(files, [])
+
+    assert result["added"] == ["a.txt", "new.txt"]
+    assert result["removed"] == ["b.txt", "old.txt"]
+    assert files["added"] == ["a.txt"]
+    assert files["removed"] == ["b.txt"]
+
+
+def test_filter_files_by_patterns_renames_deduplicated() -> None:
+    """
+    Test that renamed paths already listed, or repeated, are only merged once.
+    """
+    files: FilesByStatus = {
+        "added": ["b.txt"],
+        "modified": [],
+        "removed": [],
+        "renamed": [{"old": "a.txt", "new": "b.txt"}, {"old": "a.txt", "new": "c.txt"}],
+    }
+
+    result = filter_files_by_patterns(files, ["**/*.txt"])
+
+    assert result["added"] == ["b.txt", "c.txt"]
+    assert result["removed"] == ["a.txt"]
+
+
+def test_filter_files_by_patterns_empty_skips_compile(mocker: "MockerFixture") -> None:
+    """
+    Test that filtering an empty change set does not compile the patterns.
+
+    Args:
+        mocker: Pytest mock fixture
+    """
+    spy = mocker.spy(utils, "compile_patterns")
+    files: FilesByStatus = {"added": [], "modified": [], "removed": [], "renamed": []}
+
+    result = filter_files_by_patterns(files, ["src/**/*.py"])
 
-    # Check renamed files - both old and new filenames should be filtered
-    assert any(
-        item["old"] == "old_name.txt" and item["new"] == "new_name.txt" for item in mock_files_by_status["renamed"]
-    )
-    assert any(
-        item["old"] == "old_script.py" and item["new"] == "new_script.py" for item in mock_files_by_status["renamed"]
-    )
+    assert result == {"added": [], "modified": [], "removed": [], "renamed": []}
+    spy.assert_not_called()
 
 
 def test_filter_files_by_patterns_no_patterns(mock_files_by_status: FilesByStatus) -> None:
@@ -106,5 +226,10 @@ def test_filter_files_by_patterns_no_patterns(mock_files_by_status: FilesByStatu
 
     result = filter_files_by_patterns(mock_files_by_status, patterns)
 
-    # All files should be included when no patterns are provided
-    assert result == mock_files_by_status
+    # All files should be included when no patterns are provided, with renames merged in
+    assert result == {
+        "added": ["file1.txt", "file2.py", "new_name.txt", "new_script.py"],
+        "modified": ["file3.md", "file4.yaml"],
+        "removed": ["file5.json", "old_name.txt", "old_script.py"],
+        "renamed": mock_files_by_status["renamed"],
+    }
@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
 """Shared utilities for the diff action."""
 
-from pathlib import PurePath
-from typing import TypedDict
+import functools
+import glob
+import re
+from pathlib import PurePosixPath
+from typing import Callable, TypedDict
+
+# Characters that make a glob pattern more than a literal path
+_GLOB_MAGIC = frozenset("*?[")
+
+# Patterns that match every path
+_MATCH_ALL_PATTERNS = frozenset({"**", "**/*"})
 
 
 class FilesByStatus(TypedDict):
@@ -22,9 +31,116 @@ class OutputFormat(TypedDict):
     deleted: list[str]
 
 
+def _has_magic(pattern: str) -> bool:
+    """
+    Check whether a glob pattern contains wildcard characters.
+
+    Args:
+        pattern: Glob pattern to inspect
+
+    Returns:
+        True if the pattern contains any of '*', '?' or '['
+    """
+    return not _GLOB_MAGIC.isdisjoint(pattern)
+
+
+def compile_patterns(patterns: list[str]) -> Callable[[str], bool]:
+    """
+    Compile glob patterns into a single predicate with the same semantics as PurePath.full_match.
+
+    A path matches if it matches any of the patterns. Common pattern shapes are grouped so each
+    group is checked with one C-level call: literal paths with a set lookup, "**/*<suffix>" with
+    str.endswith and "<dir>/**" with str.startswith. All remaining patterns are translated with
+    glob.translate (what pathlib uses internally) and joined into one alternation regex. Paths are
+    matched as the POSIX-style paths reported by git and the GitHub API.
+
+    The filter inputs are the same for the whole run, so matchers are cached per pattern list.
+
+    Args:
+        patterns: list of glob patterns to compile
+
+    Returns:
+        Function returning True if a file path matches at least one pattern
+    """
+    return _compile_pattern_tuple(tuple(patterns))
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_pattern_tuple(patterns: tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    Compile a tuple of glob patterns into a single predicate (see compile_patterns).
+
+    Args:
+        patterns: tuple of glob patterns to compile
+
+    Returns:
+        Function returning True if a file path matches at least one pattern
+    """
+    literals: set[str] = set()
+    suffixes: list[str] = []
+    prefixes: list[str] = []
+    regexes: list[str] = []
+
+    for raw_pattern in patterns:
+        pattern = str(PurePosixPath(raw_pattern))
+
+        if pattern in _MATCH_ALL_PATTERNS:
+            return lambda _path: True
+
+        # Literal path, e.g. "src/main.py"
+        if not _has_magic(pattern):
+            literals.add(pattern)
+            continue
+
+        # Extension or filename suffix anywhere in the tree, e.g. "**/*.py"
+        suffix = pattern.removeprefix("**/*")
+        if suffix != pattern and "/" not in suffix and not _has_magic(suffix):
+            suffixes.append(suffix)
+            continue
+
+        # Everything below a literal directory, e.g. "docs/**".
+        # File paths never end in "/", so a prefix match always has at least one more segment.
+        prefix = pattern.removesuffix("**")
+        if prefix != pattern and prefix.endswith("/") and not _has_magic(prefix):
+            prefixes.append(prefix)
+            continue
+
+        regexes.append(glob.translate(pattern, recursive=True, include_hidden=True, seps="/"))
+
+    suffix_tuple = tuple(suffixes)
+    prefix_tuple = tuple(prefixes)
+    combined = re.compile("|".join(f"(?:{regex})" for regex in regexes)) if regexes else None
+
+    def matches(path: str) -> bool:
+        return (
+            path in literals
+            or path.endswith(suffix_tuple)
+            or path.startswith(prefix_tuple)
+            or (combined is not None and combined.match(path) is not None)
+        )
+
+    return matches
+
+
+def pattern_matcher(patterns: list[str] | None) -> Callable[[str], bool] | None:
+    """
+    Get the compiled matcher for a pattern list, or None when the patterns keep every path.
+
+    Args:
+        patterns: list of glob patterns to match against
+
+    Returns:
+        Function returning True if a file path matches at least one pattern, or None
+    """
+    if not patterns or not _MATCH_ALL_PATTERNS.isdisjoint(patterns):
+        return None
+
+    return compile_patterns(patterns)
+
+
 def filter_paths_with_patterns(file_paths: list[str], patterns: list[str]) -> list[str]:
     """
-    Filter a list of file paths using glob patterns with pathlib.
+    Filter a list of file paths using glob patterns.
 
     Args:
         file_paths: list of file paths to filter
@@ -33,24 +149,33 @@ def filter_paths_with_patterns(file_paths: list[str], patterns: list[str]) -> li
     Returns:
         Filtered list of file paths that match at least one pattern
     """
-    if not patterns or patterns == ["**/*"]:
+    matches = pattern_matcher(patterns)
+    if matches is None:
         return file_paths
 
-    filtered_paths = []
-    for path_str in file_paths:
-        path = PurePath(path_str)
+    return _filter_with_matcher(file_paths, matches)
 
-        # Check if the path matches any of the patterns
-        matched = any(path.full_match(pattern) for pattern in patterns)
-        if matched:
-            filtered_paths.append(path_str)
 
-    return filtered_paths
+def _filter_with_matcher(file_paths: list[str], matches: Callable[[str], bool] | None) -> list[str]:
+    """
+    Filter file paths with an already compiled matcher into a new list.
+
+    Args:
+        file_paths: list of file paths to filter
+        matches: Compiled matcher, or None to keep every path
+
+    Returns:
+        New list of the file paths accepted by the matcher
+    """
+    if matches is None or not file_paths:
+        return list(file_paths)
+
+    return [path for path in file_paths if matches(path)]
 
 
 def filter_files_by_patterns(files: FilesByStatus, patterns: list[str]) -> FilesByStatus:
     """
-    Filter changed files by glob patterns using pathlib.
+    Filter changed files by glob patterns.
 
     Args:
         files: FilesByStatus dictionary with files categorized by status
@@ -59,19 +184,58 @@ def filter_files_by_patterns(files: FilesByStatus, patterns: list[str]) -> Files
     Returns:
         Filtered FilesByStatus dictionary
     """
+    # Nothing changed, so there is no matcher to resolve
+    if not (files["added"] or files["modified"] or files["removed"] or files["renamed"]):
+        return {"added": [], "modified": [], "removed": [], "renamed": []}
+
+    # Resolve the matcher once and apply it to every bucket and rename.
+    # Each bucket is a new list, so merging renames never touches the caller's lists.
+    matches = pattern_matcher(patterns)
 
     filtered: FilesByStatus = {
-        "added": filter_paths_with_patterns(files["added"], patterns),
-        "modified": filter_paths_with_patterns(files["modified"], patterns),
-        "removed": filter_paths_with_patterns(files["removed"], patterns),
+        "added": _filter_with_matcher(files["added"], matches),
+        "modified": _filter_with_matcher(files["modified"], matches),
+        "removed": _filter_with_matcher(files["removed"], matches),
+        "renamed": [],
     }
 
-    # Filter renamed files
-    for renamed_item in files["renamed"]:
-        if renamed_item["old"] not in filtered["removed"]:
-            filtered["removed"].extend(filter_paths_with_patterns([renamed_item["old"]], patterns))
+    merge_renames(filtered, files["renamed"], matches)
+    return filtered
 
-        if renamed_item["new"] not in filtered["added"]:
-            filtered["added"].extend(filter_paths_with_patterns([renamed_item["new"]], patterns))
 
-    return filtered
+def merge_renames(
+    filtered: FilesByStatus, renames: list[dict[str, str]], matches: Callable[[str], bool] | None
+) -> None:
+    """
+    Merge renamed files into already filtered buckets, in place.
+
+    Renames count as removing the old path and adding the new one, each only if it matches and
+    is not listed yet. A rename is kept under "renamed" when either of its paths matches.
+
+    Args:
+        filtered: Filtered FilesByStatus whose removed, added and renamed lists are extended
+        renames: Unfiltered renames, as dicts with "old" and "new" paths
+        matches: Compiled matcher, or None to keep every path
+    """
+    removed = filtered["removed"]
+    added = filtered["added"]
+    renamed = filtered["renamed"]
+
+    # Sets keep the dedupe O(1) on large renames
+    removed_seen = set(removed)
+    added_seen = set(added)
+    for renamed_item in renames:
+        old_path = renamed_item["old"]
+        old_matches = matches is None or matches(old_path)
+        if old_matches and old_path not in removed_seen:
+            removed_seen.add(old_path)
+            removed.append(old_path)
+
+        new_path = renamed_item["new"]
+        new_matches = matches is None or matches(new_path)
+        if new_matches and new_path not in added_seen:
+            added_seen.add(new_path)
+            added.append(new_path)
+
+        if old_matches or new_matches:
+            renamed.append(renamed_item)